@@ -1,9 +1,35 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+import os
+
+# Cooperative multitasking for production SocketIO workers. Monkey-patching
+# must happen before any other import touches sockets/threads, so this block
+# sits at the very top of the module. The default (threading) needs no patch
+# and keeps local development on plain `python app.py` working.
+_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+if _ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif _ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g
+from flask.logging import default_handler
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import selectinload
+from flask_caching import Cache
+import sqlite3
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from werkzeug.security import generate_password_hash, check_password_hash
-import os
-from datetime import datetime, timezone
+import json
+import logging
+import queue
+import threading
+from jinja2 import FileSystemBytecodeCache
+from datetime import datetime, timezone, timedelta, time as dt_time
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
 import uuid
 from blockchain import get_blockchain
 from blockchain.realtime_chain import init_realtime_blockchain, get_realtime_blockchain
@@ -13,18 +39,121 @@ app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Persist compiled Jinja templates across restarts and gunicorn workers so
+# warm starts skip template parsing entirely. The cache lives under the
+# app's own instance directory: Jinja loads these files with marshal, so
+# they must never sit at a predictable world-writable /tmp path where
+# another local user could seed poisoned bytecode
+_jinja_cache_dir = os.path.join(app.instance_path, 'jinja_cache')
+os.makedirs(_jinja_cache_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_jinja_cache_dir)
+if os.environ.get('FLASK_ENV') != 'development':
+    app.jinja_env.auto_reload = False
+
+# Connection pool tuning for the concurrent SocketIO workload
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 20,
+    'max_overflow': 40,
+    'pool_pre_ping': True,
+    'pool_recycle': 1800
+}
+
+# Optional orjson (C extension) - serializes SocketIO payloads several times
+# faster than stdlib json
+try:
+    import orjson
+
+    class _ORJSONWrapper:
+        @staticmethod
+        def dumps(obj, *args, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        @staticmethod
+        def loads(data, *args, **kwargs):
+            return orjson.loads(data)
+
+    _socketio_json = _ORJSONWrapper
+except ImportError:
+    _socketio_json = json
+
 # Initialize SocketIO for real-time communication
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+# Use gevent/eventlet workers in production (SOCKETIO_ASYNC_MODE=gevent) so
+# thousands of websockets don't each pin an OS thread. With a Redis
+# message queue (SOCKETIO_MESSAGE_QUEUE=redis://...) emits become
+# fire-and-forget pub/sub instead of blocking on per-client socket writes.
+socketio = SocketIO(app, cors_allowed_origins="*",
+                    async_mode=_ASYNC_MODE,
+                    message_queue=os.environ.get('SOCKETIO_MESSAGE_QUEUE'),
+                    json=_socketio_json)
+
+# Cache for platform-wide statistics (Redis when REDIS_URL is set, in-process otherwise)
+app.config['CACHE_TYPE'] = 'RedisCache' if os.environ.get('REDIS_URL') else 'SimpleCache'
+app.config['CACHE_REDIS_URL'] = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+app.config['CACHE_DEFAULT_TIMEOUT'] = 60
+cache = Cache(app)
+
+# GreenChain has no internal locking, and certificate issuance runs on a
+# background task while retirement still runs on request threads. Every
+# chain mutation funnels through this lock so overlapping operations
+# cannot interleave mining against the same tip or the append/journal
+# writes in add_block. (Under eventlet/gevent the monkey patch makes
+# this a green-thread lock.)
+_blockchain_lock = threading.Lock()
+
+# Buffered logging: records are handed to an in-memory queue so formatting and
+# stream I/O happen on a background thread, not in the WebSocket hot path.
+# Flask's synchronous stderr handler comes off first, otherwise it stays
+# attached alongside the queue and every record is formatted and written
+# twice - once of them blocking on stream I/O again
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+app.logger.removeHandler(default_handler)
+app.logger.addHandler(QueueHandler(_log_queue))
+
+# Server-side sessions in Redis when available - the cookie shrinks to a
+# session id and per-request HMAC/deserialization cost drops
+if os.environ.get('REDIS_URL'):
+    import redis
+    from flask_session import Session
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis.from_url(os.environ['REDIS_URL'])
+    Session(app)
 
 db = SQLAlchemy(app)
 
+# SQLite tuning: WAL lets dashboard reads proceed while authority approvals
+# write, NORMAL sync + mmap/page cache cut fsync and read() overhead
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
+# Write paths stamp UTC timestamps constantly; bind the clock references once
+# at module level so the hot path skips the repeated attribute lookups
+_UTC = timezone.utc
+_utcnow = datetime.now
+
+
+# Price per token for each certification type (built once at import time)
+PRICE_MAPPING = {
+    'standard': 2.5,
+    'premium': 4.2,
+    'ultra': 5.5
+}
+
 # User model
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(120), nullable=False)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: _utcnow(_UTC))
     user_type = db.Column(db.String(20), default='user')  # 'user' or 'authority'
     tokens = db.Column(db.Integer, default=0)  # Number of hydrogen tokens owned
 
@@ -51,7 +180,7 @@ class HydrogenCredit(db.Model):
     description = db.Column(db.Text, nullable=True)
     price_per_token = db.Column(db.Float, nullable=False)  # Price per token
     status = db.Column(db.String(20), default='pending')  # 'pending', 'approved', 'rejected', 'available', 'sold', 'retired'
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: _utcnow(_UTC))
     verified_at = db.Column(db.DateTime, nullable=True)
     verified_by = db.Column(db.String(100), nullable=True)
     rejection_reason = db.Column(db.Text, nullable=True)
@@ -59,10 +188,21 @@ class HydrogenCredit(db.Model):
     certificate_id = db.Column(db.String(36), nullable=True)
     sold_at = db.Column(db.DateTime, nullable=True)
     retired_at = db.Column(db.DateTime, nullable=True)
+    verification_status = db.Column(db.String(20), nullable=True)  # cached blockchain verdict
+    last_verified_at = db.Column(db.DateTime, nullable=True)
 
     seller = db.relationship('User', foreign_keys=[seller_id])
     buyer = db.relationship('User', foreign_keys=[buyer_id])
 
+    # Composite indexes for the hot dashboard/panel queries (filter by
+    # seller/buyer + status, or by status ordered by created_at)
+    __table_args__ = (
+        db.Index('ix_hc_seller_status', 'seller_id', 'status'),
+        db.Index('ix_hc_buyer_status', 'buyer_id', 'status'),
+        db.Index('ix_hc_status_created', 'status', 'created_at'),
+        db.Index('ix_hc_status_verified', 'status', 'verified_at'),
+    )
+
 # Transaction model
 class Transaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -72,20 +212,77 @@ class Transaction(db.Model):
     buyer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     transaction_type = db.Column(db.String(20), nullable=False)  # 'sale', 'retirement'
     amount = db.Column(db.Float, nullable=False)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: _utcnow(_UTC))
 
     credit = db.relationship('HydrogenCredit')
     seller = db.relationship('User', foreign_keys=[seller_id])
     buyer = db.relationship('User', foreign_keys=[buyer_id])
 
+    __table_args__ = (
+        db.Index('ix_tx_seller', 'seller_id'),
+        db.Index('ix_tx_buyer', 'buyer_id'),
+    )
+
+def _ensure_schema():
+    """Add columns introduced after the original schema (no migrations here)"""
+    with app.app_context():
+        try:
+            existing = {row[1] for row in db.session.execute(text("PRAGMA table_info(hydrogen_credit)"))}
+            if existing and 'verification_status' not in existing:
+                db.session.execute(text("ALTER TABLE hydrogen_credit ADD COLUMN verification_status VARCHAR(20)"))
+                db.session.execute(text("ALTER TABLE hydrogen_credit ADD COLUMN last_verified_at DATETIME"))
+                db.session.commit()
+        except Exception as e:
+            print(f"⚠️ Schema check failed: {e}")
+
+_ensure_schema()
+
+# Platform-wide counters maintained incrementally (singleton row)
+class PlatformStat(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    active_suppliers = db.Column(db.Integer, default=0, nullable=False)
+
+    @classmethod
+    def get(cls):
+        stat = db.session.get(cls, 1)
+        if stat is None:
+            # Backfill from existing data on first use
+            count = db.session.query(db.func.count(db.distinct(HydrogenCredit.seller_id))).scalar() or 0
+            stat = cls(id=1, active_suppliers=count)
+            db.session.add(stat)
+            db.session.commit()
+        return stat
+
+@cache.cached(timeout=60, key_prefix='platform_stats')
+def get_platform_stats():
+    """Platform-wide dashboard statistics (identical for every user)"""
+    total_platform_credits = HydrogenCredit.query.count()
+    total_platform_transactions = Transaction.query.count()
+    avg_platform_price = db.session.query(db.func.avg(HydrogenCredit.price_per_token)).scalar() or 0
+    active_suppliers = PlatformStat.get().active_suppliers
+    return total_platform_credits, total_platform_transactions, avg_platform_price, active_suppliers
+
+def invalidate_platform_stats():
+    """Drop the cached platform statistics after a write that changes them"""
+    cache.delete('platform_stats')
+
+@app.before_request
+def load_current_user():
+    """Resolve the logged-in user once per request via the session identity map"""
+    if request.endpoint == 'static':
+        g.user = None
+        return
+    user_id = session.get('user_id')
+    g.user = db.session.get(User, user_id) if user_id is not None else None
+
 # Login required decorator
 def login_required(f):
+    @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
+        if session.get('user_id') is None:
             flash('Please log in to access this page.', 'error')
             return redirect(url_for('login'))
         return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
     return decorated_function
 
 @app.route('/')
@@ -95,7 +292,7 @@ def home():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    user = User.query.get(session['user_id'])
+    user = g.user
     
     # Check if user exists in database
     if not user:
@@ -105,43 +302,79 @@ def dashboard():
         return redirect(url_for('login'))
     
     # Get user's credits and transactions (users can both buy and sell)
-    # Seller statistics
-    total_credits_sold = HydrogenCredit.query.filter_by(seller_id=user.id).count()
-    sold_credits = HydrogenCredit.query.filter_by(seller_id=user.id, status='sold').count()
-    available_credits = HydrogenCredit.query.filter_by(seller_id=user.id, status='approved').count()
-    total_revenue = db.session.query(db.func.sum(Transaction.amount)).filter_by(seller_id=user.id).scalar() or 0
-    total_tokens_sold = db.session.query(db.func.sum(HydrogenCredit.tokens_generated)).filter_by(seller_id=user.id, status='sold').scalar() or 0
-    
-    # Buyer statistics
-    total_credits_bought = HydrogenCredit.query.filter_by(buyer_id=user.id).count()
-    total_spent = db.session.query(db.func.sum(Transaction.amount)).filter_by(buyer_id=user.id).scalar() or 0
-    total_tokens_bought = db.session.query(db.func.sum(HydrogenCredit.tokens_generated)).filter_by(buyer_id=user.id, status='sold').scalar() or 0
-    avg_price = db.session.query(db.func.avg(HydrogenCredit.price_per_token)).filter_by(buyer_id=user.id, status='sold').scalar() or 0
+    # Seller + buyer statistics in one conditional-aggregate query instead of
+    # one round-trip per metric
+    (total_credits_sold, sold_credits, available_credits, total_tokens_sold,
+     total_credits_bought, total_tokens_bought, avg_price) = db.session.query(
+        db.func.count(db.case((HydrogenCredit.seller_id == user.id, 1))),
+        db.func.count(db.case((db.and_(HydrogenCredit.seller_id == user.id, HydrogenCredit.status == 'sold'), 1))),
+        db.func.count(db.case((db.and_(HydrogenCredit.seller_id == user.id, HydrogenCredit.status == 'approved'), 1))),
+        db.func.sum(db.case((db.and_(HydrogenCredit.seller_id == user.id, HydrogenCredit.status == 'sold'), HydrogenCredit.tokens_generated))),
+        db.func.count(db.case((HydrogenCredit.buyer_id == user.id, 1))),
+        db.func.sum(db.case((db.and_(HydrogenCredit.buyer_id == user.id, HydrogenCredit.status == 'sold'), HydrogenCredit.tokens_generated))),
+        db.func.avg(db.case((db.and_(HydrogenCredit.buyer_id == user.id, HydrogenCredit.status == 'sold'), HydrogenCredit.price_per_token)))
+    ).one()
+    total_tokens_sold = total_tokens_sold or 0
+    total_tokens_bought = total_tokens_bought or 0
+    avg_price = avg_price or 0
+
+    # Revenue (as seller) and spend (as buyer) in a single Transaction query
+    total_revenue, total_spent = db.session.query(
+        db.func.sum(db.case((Transaction.seller_id == user.id, Transaction.amount))),
+        db.func.sum(db.case((Transaction.buyer_id == user.id, Transaction.amount)))
+    ).one()
+    total_revenue = total_revenue or 0
+    total_spent = total_spent or 0
     
     # Combined recent transactions (both buying and selling)
-    recent_transactions = db.session.query(Transaction).filter(
+    # selectinload the credit relationship up front so the template doesn't
+    # trigger one lazy SELECT per transaction row
+    recent_transactions = db.session.query(Transaction).options(
+        selectinload(Transaction.credit)
+    ).filter(
         (Transaction.seller_id == user.id) | (Transaction.buyer_id == user.id)
     ).order_by(Transaction.created_at.desc()).limit(5).all()
     
-    # Platform statistics
-    total_platform_credits = HydrogenCredit.query.count()
-    total_platform_transactions = Transaction.query.count()
-    avg_platform_price = db.session.query(db.func.avg(HydrogenCredit.price_per_token)).scalar() or 0
-    active_suppliers = db.session.query(db.func.count(db.distinct(HydrogenCredit.seller_id))).scalar() or 0
+    # Platform statistics (cached - identical for every user)
+    (total_platform_credits, total_platform_transactions,
+     avg_platform_price, active_suppliers) = get_platform_stats()
     
-    # Get user's blockchain certificates
+    # Get user's blockchain certificates (filter in SQL instead of fetching
+    # every row and discarding most of them in Python)
     user_certificates = HydrogenCredit.query.filter_by(seller_id=user.id).all()
-    active_certificates = [c for c in user_certificates if c.blockchain_hash and c.status != 'sold']
-    retired_certificates = [c for c in user_certificates if c.retired_at is not None]
+    active_certificates = HydrogenCredit.query.filter(
+        HydrogenCredit.seller_id == user.id,
+        HydrogenCredit.blockchain_hash.isnot(None),
+        HydrogenCredit.status != 'sold'
+    ).all()
+    retired_certificates = HydrogenCredit.query.filter(
+        HydrogenCredit.seller_id == user.id,
+        HydrogenCredit.retired_at.isnot(None)
+    ).all()
     
     # Get available verified credits for buyers (all approved credits from other users)
-    available_verified_credits = db.session.query(HydrogenCredit, User.username.label('seller_name')).join(
+    # Core SELECT of just the displayed columns - skips full ORM instance
+    # materialization and unit-of-work tracking for read-only rows
+    credits_stmt = db.select(
+        HydrogenCredit.credit_id,
+        HydrogenCredit.facility_name,
+        HydrogenCredit.location,
+        HydrogenCredit.renewable_source,
+        HydrogenCredit.certification_type,
+        HydrogenCredit.description,
+        HydrogenCredit.production_date,
+        HydrogenCredit.tokens_generated,
+        HydrogenCredit.price_per_token,
+        HydrogenCredit.blockchain_hash,
+        User.username.label('seller_name')
+    ).join(
         User, HydrogenCredit.seller_id == User.id
-    ).filter(
+    ).where(
         HydrogenCredit.status == 'approved',
         HydrogenCredit.seller_id != user.id,  # Exclude user's own credits
         HydrogenCredit.buyer_id.is_(None)  # Only unsold credits
-    ).order_by(HydrogenCredit.created_at.desc()).all()
+    ).order_by(HydrogenCredit.created_at.desc())
+    available_verified_credits = [(row, row.seller_name) for row in db.session.execute(credits_stmt)]
     
     return render_template('dashboard.html', 
                          user=user, 
@@ -219,7 +452,7 @@ def register():
 @app.route('/seller_panel')
 @login_required
 def seller_panel():
-    user = User.query.get(session['user_id'])
+    user = g.user
     
     # Check if user exists in database
     if not user:
@@ -228,10 +461,14 @@ def seller_panel():
         flash('User account not found. Please log in again.', 'error')
         return redirect(url_for('login'))
     
-    # Get seller statistics (any user can sell)
-    total_credits = HydrogenCredit.query.filter_by(seller_id=user.id).count()
+    # Get seller statistics (any user can sell) - one conditional-aggregate
+    # query per table instead of one query per metric
+    total_credits, total_tokens = db.session.query(
+        db.func.count(),
+        db.func.sum(db.case((HydrogenCredit.status == 'approved', HydrogenCredit.tokens_generated)))
+    ).filter(HydrogenCredit.seller_id == user.id).one()
+    total_tokens = total_tokens or 0
     total_revenue = db.session.query(db.func.sum(Transaction.amount)).filter_by(seller_id=user.id).scalar() or 0
-    total_tokens = db.session.query(db.func.sum(HydrogenCredit.tokens_generated)).filter_by(seller_id=user.id, status='approved').scalar() or 0
     
     # Get recent submissions
     recent_submissions = HydrogenCredit.query.filter_by(seller_id=user.id).order_by(HydrogenCredit.created_at.desc()).limit(5).all()
@@ -247,7 +484,7 @@ def seller_panel():
 @login_required
 def submit_production():
     try:
-        user = User.query.get(session['user_id'])
+        user = g.user
         
         # Check if user exists in database
         if not user:
@@ -270,12 +507,7 @@ def submit_production():
         tokens_generated = int(hydrogen_weight_kg)
         
         # Calculate price per token based on certification type
-        price_mapping = {
-            'standard': 2.5,
-            'premium': 4.2,
-            'ultra': 5.5
-        }
-        price_per_token = price_mapping.get(certification_type, 2.5)
+        price_per_token = PRICE_MAPPING.get(certification_type, 2.5)
         
         # Create new hydrogen credit
         new_credit = HydrogenCredit(
@@ -293,55 +525,75 @@ def submit_production():
             status='pending'
         )
         
+        # First submission from this seller bumps the active-supplier counter.
+        # Resolve the singleton row before the new credit enters the session:
+        # a first-use backfill both counts existing sellers (it must not see
+        # this one yet, or the increment below double-counts) and commits,
+        # which must not sweep the in-flight credit along with it
+        first_submission = not db.session.query(
+            HydrogenCredit.query.filter_by(seller_id=user.id).exists()
+        ).scalar()
+        stats = PlatformStat.get() if first_submission else None
+
+        # Single transaction: flush to assign new_credit.id, then one commit
+        # (one fsync) covering the credit and the supplier counter together
         db.session.add(new_credit)
+        db.session.flush()
+        if first_submission:
+            stats.active_suppliers += 1
         db.session.commit()
+        invalidate_platform_stats()
+
+        # Issue blockchain certificate in the background - mining is CPU-bound
+        # and shouldn't block the HTTP response
+        certificate_data = {
+            'seller_id': user.id,
+            'facility_name': facility_name,
+            'hydrogen_weight_kg': hydrogen_weight_kg,
+            'tokens_generated': tokens_generated,
+            'renewable_source': renewable_source,
+            'production_date': production_date.isoformat(),
+            'location': location,
+            'certification_type': certification_type,
+            'price_per_token': price_per_token
+        }
+        socketio.start_background_task(issue_certificate_async, new_credit.id, certificate_data)
+
+        flash(f'Production data submitted successfully! {tokens_generated} tokens generated for {hydrogen_weight_kg} kg of {renewable_source} hydrogen. Blockchain certificate is being issued.', 'success')
+
+        return redirect(url_for('seller_panel'))
         
-        # Issue blockchain certificate
+    except Exception as e:
+        flash(f'Error submitting production data: {str(e)}', 'error')
+        return redirect(url_for('seller_panel'))
+
+def issue_certificate_async(credit_db_id, certificate_data):
+    """Mine and record a blockchain certificate outside the request thread"""
+    with app.app_context():
         try:
             blockchain = get_blockchain()
-            certificate_data = {
-                'seller_id': user.id,
-                'facility_name': facility_name,
-                'hydrogen_weight_kg': hydrogen_weight_kg,
-                'tokens_generated': tokens_generated,
-                'renewable_source': renewable_source,
-                'production_date': production_date.isoformat(),
-                'location': location,
-                'certification_type': certification_type,
-                'price_per_token': price_per_token
-            }
-            
-            blockchain_hash = blockchain.issue_certificate(certificate_data)
-            
+            with _blockchain_lock:
+                blockchain_hash = blockchain.issue_certificate(certificate_data)
+
             # Update credit with blockchain information
-            new_credit.blockchain_hash = blockchain_hash
-            new_credit.certificate_id = certificate_data.get('certificate_id', str(uuid.uuid4()))
-            db.session.commit()
-            
+            credit = db.session.get(HydrogenCredit, credit_db_id)
+            if credit:
+                credit.blockchain_hash = blockchain_hash
+                credit.certificate_id = certificate_data.get('certificate_id', str(uuid.uuid4()))
+                db.session.commit()
+
             # Emit real-time blockchain event
             realtime_chain = get_realtime_blockchain()
             if realtime_chain:
                 realtime_chain.emit_certificate_issued(certificate_data, blockchain_hash)
-            
-            flash(f'Production data submitted successfully! {tokens_generated} tokens generated for {hydrogen_weight_kg} kg of {renewable_source} hydrogen. Blockchain certificate issued with hash: {blockchain_hash[:16]}...', 'success')
-            
-        except Exception as e:
-            flash(f'Production data submitted, but blockchain certificate issuance failed: {str(e)}', 'warning')
-    
-        return redirect(url_for('seller_panel'))
-        
-    except Exception as e:
-        flash(f'Error submitting production data: {str(e)}', 'error')
-        return redirect(url_for('seller_panel'))
-        
-    except Exception as e:
-        flash(f'Error submitting production data: {str(e)}', 'error')
-        return redirect(url_for('seller_panel'))
+
+        except Exception:
+            app.logger.exception("❌ Background certificate issuance failed for credit %s", credit_db_id)
 
 @app.route('/buyer_panel')
 @login_required
 def buyer_panel():
-    user = User.query.get(session['user_id'])
+    user = g.user
     
     # Check if user exists in database
     if not user:
@@ -350,16 +602,26 @@ def buyer_panel():
         flash('User account not found. Please log in again.', 'error')
         return redirect(url_for('login'))
     
-    # Get buyer statistics (any user can buy)
-    credits_purchased = HydrogenCredit.query.filter_by(buyer_id=user.id).count()
+    # Get buyer statistics (any user can buy) - one conditional-aggregate
+    # query per table instead of one query per metric
+    credits_purchased, tokens_acquired, avg_price = db.session.query(
+        db.func.count(),
+        db.func.sum(db.case((HydrogenCredit.status == 'sold', HydrogenCredit.tokens_generated))),
+        db.func.avg(db.case((HydrogenCredit.status == 'sold', HydrogenCredit.price_per_token)))
+    ).filter(HydrogenCredit.buyer_id == user.id).one()
+    tokens_acquired = tokens_acquired or 0
+    avg_price = avg_price or 0
     total_spent = db.session.query(db.func.sum(Transaction.amount)).filter_by(buyer_id=user.id).scalar() or 0
-    tokens_acquired = db.session.query(db.func.sum(HydrogenCredit.tokens_generated)).filter_by(buyer_id=user.id, status='sold').scalar() or 0
-    avg_price = db.session.query(db.func.avg(HydrogenCredit.price_per_token)).filter_by(buyer_id=user.id, status='sold').scalar() or 0
     
-    # Get all available credits (both pending and approved) - buyers see data instantly
-    available_credits = HydrogenCredit.query.filter(
+    # Get available credits (both pending and approved) - paginated at the SQL
+    # layer so the page never fetches the whole table
+    page = request.args.get('page', 1, type=int)
+    credits_pagination = HydrogenCredit.query.filter(
         HydrogenCredit.status.in_(['pending', 'approved'])
-    ).order_by(HydrogenCredit.created_at.desc()).all()
+    ).order_by(HydrogenCredit.created_at.desc()).paginate(
+        page=page, per_page=20, error_out=False
+    )
+    available_credits = credits_pagination.items
     
     # Get purchase history
     purchase_history = Transaction.query.filter_by(buyer_id=user.id).order_by(Transaction.created_at.desc()).limit(5).all()
@@ -371,13 +633,14 @@ def buyer_panel():
                          tokens_acquired=tokens_acquired,
                          avg_price=avg_price,
                          available_credits=available_credits,
+                         credits_pagination=credits_pagination,
                          purchase_history=purchase_history)
 
 @app.route('/buy_credit', methods=['POST'])
 @login_required
 def buy_credit():
     try:
-        user = User.query.get(session['user_id'])
+        user = g.user
         
         # Check if user exists in database
         if not user:
@@ -398,25 +661,32 @@ def buy_credit():
         if credit.status != 'approved':
             flash('This credit is still pending approval and cannot be purchased yet.', 'error')
             return redirect(url_for('buyer_panel'))
-        
-        # Check if already sold
-        if credit.status == 'sold':
-            flash('Credit already sold.', 'error')
-            return redirect(url_for('buyer_panel'))
-        
+
         # Calculate total amount
         total_amount = credit.tokens_generated * credit.price_per_token
-        
+
         # Check if buyer has enough tokens or money (for now, we'll assume direct purchase)
         # In a real system, you might want to implement a token wallet
-        
-        # Update credit status
-        credit.buyer_id = user.id
-        credit.status = 'sold'
-        credit.sold_at = datetime.now(timezone.utc)
+
+        # One timestamp per request, reused for every field written below
+        now = _utcnow(_UTC)
+
+        # Atomically claim the credit - the WHERE status='approved' guard means
+        # a concurrent buyer can't purchase the same credit twice
+        claimed = db.session.query(HydrogenCredit).filter_by(
+            credit_id=credit_id, status='approved'
+        ).update({
+            'status': 'sold',
+            'buyer_id': user.id,
+            'sold_at': now
+        }, synchronize_session=False)
+        if claimed == 0:
+            db.session.rollback()
+            flash('Credit already sold.', 'error')
+            return redirect(url_for('buyer_panel'))
         
         # Transfer tokens from seller to buyer
-        seller = User.query.get(credit.seller_id)
+        seller = db.session.get(User, credit.seller_id)
         seller.tokens -= credit.tokens_generated
         user.tokens += credit.tokens_generated
         
@@ -449,8 +719,11 @@ def buy_credit():
         if credit.blockchain_hash:
             try:
                 blockchain = get_blockchain()
-                if blockchain.retire_certificate(credit.blockchain_hash):
-                    credit.retired_at = datetime.now(timezone.utc)
+                with _blockchain_lock:
+                    retired = blockchain.retire_certificate(credit.blockchain_hash)
+                if retired:
+                    credit.retired_at = now
+                    credit.verification_status = 'retired'
                     flash(f'Successfully purchased {credit.tokens_generated} tokens of {credit.renewable_source} hydrogen credits for ${total_amount:.2f}! Blockchain certificate retired.', 'success')
                 else:
                     flash(f'Credit purchased but blockchain retirement failed. Please contact support.', 'warning')
@@ -460,8 +733,9 @@ def buy_credit():
             flash(f'Successfully purchased {credit.tokens_generated} tokens of {credit.renewable_source} hydrogen credits for ${total_amount:.2f}!', 'success')
         
         db.session.commit()
+        invalidate_platform_stats()
         return redirect(url_for('buyer_panel'))
-        
+
     except Exception as e:
         flash(f'Error purchasing credit: {str(e)}', 'error')
         return redirect(url_for('buyer_panel'))
@@ -471,7 +745,7 @@ def buy_credit():
 def dashboard_buy_credit():
     """Purchase credit directly from dashboard"""
     try:
-        user = User.query.get(session['user_id'])
+        user = g.user
         
         # Check if user exists in database
         if not user:
@@ -491,22 +765,29 @@ def dashboard_buy_credit():
         if credit.status != 'approved':
             flash('Only approved credits can be purchased.', 'error')
             return redirect(url_for('dashboard'))
-        
-        # Check if credit is already sold
-        if credit.status == 'sold':
-            flash('This credit has already been sold.', 'error')
-            return redirect(url_for('dashboard'))
-        
+
         # Calculate total amount
         total_amount = credit.tokens_generated * credit.price_per_token
-        
-        # Update credit status
-        credit.status = 'sold'
-        credit.buyer_id = user.id
-        credit.sold_at = datetime.now(timezone.utc)
+
+        # One timestamp per request, reused for every field written below
+        now = _utcnow(_UTC)
+
+        # Atomically claim the credit - the WHERE status='approved' guard means
+        # a concurrent buyer can't purchase the same credit twice
+        claimed = db.session.query(HydrogenCredit).filter_by(
+            credit_id=credit_id, status='approved'
+        ).update({
+            'status': 'sold',
+            'buyer_id': user.id,
+            'sold_at': now
+        }, synchronize_session=False)
+        if claimed == 0:
+            db.session.rollback()
+            flash('This credit has already been sold.', 'error')
+            return redirect(url_for('dashboard'))
         
         # Transfer tokens from seller to buyer
-        seller = User.query.get(credit.seller_id)
+        seller = db.session.get(User, credit.seller_id)
         if seller:
             seller.tokens -= credit.tokens_generated
             user.tokens += credit.tokens_generated
@@ -518,7 +799,7 @@ def dashboard_buy_credit():
             buyer_id=user.id,
             amount=total_amount,
             transaction_type='sale',
-            created_at=datetime.now(timezone.utc)
+            created_at=now
         )
         
         db.session.add(transaction)
@@ -541,8 +822,11 @@ def dashboard_buy_credit():
         if credit.blockchain_hash:
             try:
                 blockchain = get_blockchain()
-                if blockchain.retire_certificate(credit.blockchain_hash):
-                    credit.retired_at = datetime.now(timezone.utc)
+                with _blockchain_lock:
+                    retired = blockchain.retire_certificate(credit.blockchain_hash)
+                if retired:
+                    credit.retired_at = now
+                    credit.verification_status = 'retired'
                     flash(f'Successfully purchased {credit.tokens_generated} tokens of {credit.renewable_source} hydrogen credits for ${total_amount:.2f}! Blockchain certificate retired.', 'success')
                 else:
                     flash(f'Credit purchased but blockchain retirement failed. Please contact support.', 'warning')
@@ -552,8 +836,9 @@ def dashboard_buy_credit():
             flash(f'Successfully purchased {credit.tokens_generated} tokens of {credit.renewable_source} hydrogen credits for ${total_amount:.2f}!', 'success')
         
         db.session.commit()
+        invalidate_platform_stats()
         return redirect(url_for('dashboard'))
-        
+
     except Exception as e:
         flash(f'Error purchasing credit: {str(e)}', 'error')
         return redirect(url_for('dashboard'))
@@ -562,7 +847,7 @@ def dashboard_buy_credit():
 @login_required
 def retire_credit():
     try:
-        user = User.query.get(session['user_id'])
+        user = g.user
         
         # Check if user exists in database
         if not user:
@@ -581,7 +866,7 @@ def retire_credit():
         
         # Update credit status
         credit.status = 'retired'
-        credit.retired_at = datetime.now(timezone.utc)
+        credit.retired_at = _utcnow(_UTC)
         
         # Create retirement transaction
         transaction = Transaction(
@@ -594,7 +879,8 @@ def retire_credit():
         
         db.session.add(transaction)
         db.session.commit()
-        
+        invalidate_platform_stats()
+
         flash(f'Successfully retired {credit.production_capacity} MWh of {credit.renewable_source} hydrogen credits!', 'success')
         return redirect(url_for('dashboard'))
         
@@ -605,7 +891,7 @@ def retire_credit():
 @app.route('/authority_panel')
 @login_required
 def authority_panel():
-    user = User.query.get(session['user_id'])
+    user = g.user
     
     # Check if user exists in database
     if not user:
@@ -619,38 +905,41 @@ def authority_panel():
         flash('Access denied. Authority privileges required.', 'error')
         return redirect(url_for('dashboard'))
     
-    # Get pending requests
-    pending_requests = HydrogenCredit.query.filter_by(status='pending').order_by(HydrogenCredit.created_at.asc()).all()
-    
-    # Get today's statistics
-    today = datetime.now().date()
-    approved_requests = HydrogenCredit.query.filter(
-        HydrogenCredit.status == 'approved',
-        db.func.date(HydrogenCredit.verified_at) == today
-    ).count()
+    # Get pending requests - the template shows seller details for each one,
+    # so eager-load the relationship in one IN query instead of N lazy SELECTs
+    pending_requests = HydrogenCredit.query.options(
+        selectinload(HydrogenCredit.seller)
+    ).filter_by(status='pending').order_by(HydrogenCredit.created_at.asc()).all()
     
-    rejected_requests = HydrogenCredit.query.filter(
-        HydrogenCredit.status == 'rejected',
-        db.func.date(HydrogenCredit.verified_at) == today
-    ).count()
-    
-    total_verified = HydrogenCredit.query.filter(
-        HydrogenCredit.status.in_(['approved', 'rejected'])
-    ).count()
+    # Get today's statistics as a half-open UTC range - applying date() to
+    # verified_at would defeat the index on every row
+    today_start = datetime.combine(_utcnow(_UTC).date(), dt_time.min, tzinfo=timezone.utc)
+    tomorrow_start = today_start + timedelta(days=1)
+    in_today = db.and_(HydrogenCredit.verified_at >= today_start,
+                       HydrogenCredit.verified_at < tomorrow_start)
+    approved_requests, rejected_requests, total_verified = db.session.query(
+        db.func.count(db.case((db.and_(HydrogenCredit.status == 'approved', in_today), 1))),
+        db.func.count(db.case((db.and_(HydrogenCredit.status == 'rejected', in_today), 1))),
+        db.func.count()
+    ).filter(HydrogenCredit.status.in_(['approved', 'rejected'])).one()
     
     # Get recent decisions
     recent_decisions = HydrogenCredit.query.filter(
         HydrogenCredit.status.in_(['approved', 'rejected'])
     ).order_by(HydrogenCredit.verified_at.desc()).limit(10).all()
     
-    # Get seller credits count for each pending request
-    seller_credits_count = {}
-    for request in pending_requests:
-        count = HydrogenCredit.query.filter_by(
-            seller_id=request.seller_id, 
-            status='approved'
-        ).count()
-        seller_credits_count[request.seller_id] = count
+    # Get seller credits count for each pending request (one GROUP BY query
+    # instead of one COUNT per pending request)
+    seller_ids = {pending.seller_id for pending in pending_requests}
+    seller_credits_count = {seller_id: 0 for seller_id in seller_ids}
+    if seller_ids:
+        rows = db.session.query(
+            HydrogenCredit.seller_id, db.func.count()
+        ).filter(
+            HydrogenCredit.seller_id.in_(seller_ids),
+            HydrogenCredit.status == 'approved'
+        ).group_by(HydrogenCredit.seller_id).all()
+        seller_credits_count.update(dict(rows))
     
     return render_template('authority.html',
                          user=user,
@@ -665,7 +954,7 @@ def authority_panel():
 @login_required
 def verify_request():
     try:
-        user = User.query.get(session['user_id'])
+        user = g.user
         
         # Check if user exists in database
         if not user:
@@ -681,39 +970,60 @@ def verify_request():
         
         credit_id = request.form['credit_id']
         action = request.form['action']
-        
-        # Get the credit
-        credit = HydrogenCredit.query.filter_by(credit_id=credit_id, status='pending').first()
-        if not credit:
-            flash('Credit request not found or already processed.', 'error')
-            return redirect(url_for('authority_panel'))
-        
+        now = _utcnow(_UTC)
+
         if action == 'approve':
-            # Approve the credit
-            credit.status = 'approved'
-            credit.verified_at = datetime.now(timezone.utc)
-            credit.verified_by = user.username
-            
-            # Give tokens to the seller (1 kg = 1 token)
-            seller = User.query.get(credit.seller_id)
-            seller.tokens += credit.tokens_generated
-            
+            # Conditional UPDATE guarded on status='pending': exactly one
+            # authority can win the transition, and rowcount tells us whether
+            # we did - no pre-fetch SELECT needed
+            claimed = db.session.query(HydrogenCredit).filter_by(
+                credit_id=credit_id, status='pending'
+            ).update({
+                'status': 'approved',
+                'verified_at': now,
+                'verified_by': user.username
+            }, synchronize_session=False)
+
+            if claimed == 0:
+                db.session.rollback()
+                flash('Credit request not found or already processed.', 'error')
+                return redirect(url_for('authority_panel'))
+
+            # Fetch the claimed row only now, for the token grant and flash
+            credit = HydrogenCredit.query.filter_by(credit_id=credit_id).first()
+
+            # Give tokens to the seller (1 kg = 1 token) - DB-side increment
+            # stays atomic under concurrent approvals
+            db.session.query(User).filter_by(id=credit.seller_id).update(
+                {'tokens': User.tokens + credit.tokens_generated},
+                synchronize_session=False
+            )
+
             flash(f'Successfully approved {credit.hydrogen_weight_kg} kg of {credit.renewable_source} hydrogen! Seller received {credit.tokens_generated} tokens. Credit is now active on the blockchain.', 'success')
-            
+
         elif action == 'reject':
             # Get rejection reason
             rejection_reason = request.form.get('rejection_reason', 'No reason provided')
-            
-            # Reject the credit
-            credit.status = 'rejected'
-            credit.verified_at = datetime.now(timezone.utc)
-            credit.verified_by = user.username
-            credit.rejection_reason = rejection_reason
-            
+
+            # Reject the credit with one conditional UPDATE - no lookup at all
+            claimed = db.session.query(HydrogenCredit).filter_by(
+                credit_id=credit_id, status='pending'
+            ).update({
+                'status': 'rejected',
+                'verified_at': now,
+                'verified_by': user.username,
+                'rejection_reason': rejection_reason
+            }, synchronize_session=False)
+
+            if claimed == 0:
+                db.session.rollback()
+                flash('Credit request not found or already processed.', 'error')
+                return redirect(url_for('authority_panel'))
+
             flash(f'Request rejected: {rejection_reason}', 'error')
-            
 
-        
+
+
         else:
             flash('Invalid action specified.', 'error')
             return redirect(url_for('authority_panel'))
@@ -730,7 +1040,7 @@ def verify_request():
 @app.route('/blockchain_dashboard')
 @login_required
 def blockchain_dashboard():
-    user = User.query.get(session['user_id'])
+    user = g.user
     
     # Check if user exists in database
     if not user:
@@ -743,20 +1053,33 @@ def blockchain_dashboard():
         blockchain = get_blockchain()
         chain_info = blockchain.get_chain_info()
         
-        # Get user's certificates
+        # Get user's certificates; only re-verify the ones without a cached
+        # verdict - post-approval validity only changes when the app itself
+        # retires a certificate, which clears the cached status
         user_certificates = HydrogenCredit.query.filter_by(seller_id=user.id).all()
+        to_verify = [cert for cert in user_certificates
+                     if cert.blockchain_hash and cert.verification_status is None]
+        verifications = blockchain.verify_certificates_bulk(
+            [cert.blockchain_hash for cert in to_verify])
+
+        verified_at = _utcnow(_UTC)
+        for cert in to_verify:
+            is_valid, _cert_data, status = verifications[cert.blockchain_hash]
+            cert.verification_status = 'valid' if is_valid else status
+            cert.last_verified_at = verified_at
+        if to_verify:
+            db.session.commit()
+
         user_certificates_data = []
-        
         for cert in user_certificates:
             if cert.blockchain_hash:
-                is_valid, cert_data = blockchain.verify_certificate(cert.blockchain_hash)
-                status = blockchain.get_certificate_status(cert.blockchain_hash)
+                cert_record = blockchain.get_certificate_by_hash(cert.blockchain_hash)
                 user_certificates_data.append({
                     'credit': cert,
                     'blockchain_hash': cert.blockchain_hash,
-                    'is_valid': is_valid,
-                    'status': status,
-                    'certificate_data': cert_data
+                    'is_valid': cert.verification_status == 'valid',
+                    'status': 'active' if cert.verification_status == 'valid' else cert.verification_status,
+                    'certificate_data': cert_record['data'] if cert_record else {'error': 'Certificate not found'}
                 })
         
         return render_template('blockchain_dashboard.html',
@@ -771,7 +1094,7 @@ def blockchain_dashboard():
 @app.route('/realtime_blockchain')
 @login_required
 def realtime_blockchain_dashboard():
-    user = User.query.get(session['user_id'])
+    user = g.user
     
     # Check if user exists in database
     if not user:
@@ -809,8 +1132,8 @@ def logout():
 def add_sample_data():
     """Add sample data to the database for demonstration"""
     with app.app_context():
-        # Check if sample data already exists
-        if User.query.count() > 0:
+        # Check if sample data already exists (probe one row, don't COUNT the table)
+        if db.session.query(User.id).first() is not None:
             return
         
         # Create sample users
@@ -828,8 +1151,8 @@ def add_sample_data():
         authority1.set_password('password123')
         
         db.session.add_all([user1, user2, user3, authority1])
-        db.session.commit()
-        
+        db.session.flush()  # assign user ids without an intermediate commit
+
         # Create sample hydrogen credits
         credit1 = HydrogenCredit(
             seller_id=user1.id,
@@ -844,7 +1167,7 @@ def add_sample_data():
             description='High-efficiency solar hydrogen production',
             price_per_token=2.5,      # $2.50 per token
             status='approved',
-            verified_at=datetime.now(timezone.utc),
+            verified_at=_utcnow(_UTC),
             verified_by='solar_farm'  # Self-verified for demo
         )
         
@@ -887,13 +1210,16 @@ def add_sample_data():
 @socketio.on('connect', namespace='/blockchain')
 def handle_connect():
     """Handle WebSocket connection"""
-    print(f"🔌 Client connected: {request.sid}")
+    app.logger.debug("🔌 Client connected: %s", request.sid)
     emit('connection_status', {'status': 'connected'})
 
 @socketio.on('disconnect', namespace='/blockchain')
 def handle_disconnect():
     """Handle WebSocket disconnection"""
-    print(f"🔌 Client disconnected: {request.sid}")
+    realtime_chain = get_realtime_blockchain()
+    if realtime_chain:
+        realtime_chain.disconnect_user(str(session.get('user_id', 'anonymous')))
+    app.logger.debug("🔌 Client disconnected: %s", request.sid)
 
 @socketio.on('join_blockchain', namespace='/blockchain')
 def handle_join_blockchain():
@@ -927,7 +1253,7 @@ def handle_subscribe_events(data):
     if realtime_chain:
         user_id = session.get('user_id', 'anonymous')
         event_types = data.get('event_types', ['all'])
-        realtime_chain.subscribe_to_events(str(user_id), event_types)
+        realtime_chain.subscribe_to_events(str(user_id), event_types, session_id=request.sid)
         emit('subscription_confirmed', {'event_types': event_types})
 
 # Initialize real-time blockchain system
@@ -5,39 +5,239 @@ A simple, web-based blockchain simulation for managing Green Hydrogen Certificat
 """
 
 import hashlib
+import heapq
 import json
+import logging
 import os
+import sys
 import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple
-import uuid
+
+# Optional orjson (C extension) - dumps/loads the chain snapshot several
+# times faster than stdlib json and works in bytes directly
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional ijson - streams the snapshot during load instead of
+# materializing the whole file as one parsed document first
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Library-level events go through logging with lazy %-formatting, so the
+# message strings are never built when the handler level filters them out
+logger = logging.getLogger(__name__)
+
+# Timestamps appear as ISO strings in block data and epoch floats on the
+# blocks themselves; parse each distinct string once and memoize the float
+# so repeated sorts don't re-run datetime.fromisoformat per element
+_ts_float_cache: Dict[str, float] = {}
+
+
+def _timestamp_to_float(ts) -> float:
+    """Best-effort conversion of a mixed-type timestamp to epoch seconds"""
+    if isinstance(ts, (int, float)):
+        return ts
+    if isinstance(ts, str):
+        cached = _ts_float_cache.get(ts)
+        if cached is not None:
+            return cached
+        try:
+            value = datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            value = 0
+        _ts_float_cache[ts] = value
+        return value
+    return 0
+
+
+def _intern_if_str(value):
+    """Intern low-cardinality strings so repeated values share one object
+
+    Sources, certification types and locations repeat across certificates;
+    interning deduplicates the strings and lets dict lookups and Counter
+    increments on them hit CPython's pointer-compare fast path.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _detect_hw_sha() -> bool:
+    """Report whether the CPU advertises SHA256 instructions
+
+    Checks the x86 sha_ni flag / ARMv8 sha2 feature in /proc/cpuinfo.
+    hashlib's OpenSSL backend runtime-dispatches to those kernels on its
+    own, so this flag is informational - it lets benchmarks and
+    diagnostics tell hardware-accelerated mining apart from the portable
+    SHA256 path without recompiling anything.
+    """
+    try:
+        with open('/proc/cpuinfo') as f:
+            info = f.read()
+    except OSError:
+        return False
+    return 'sha_ni' in info or ' sha2' in info
+
+
+HAS_HW_SHA = _detect_hw_sha()
+
+# Small integer tags for the block payload types, stamped on each Block at
+# construction so chain scans branch on an int compare instead of a dict
+# lookup plus string compare per block
+TYPE_OTHER = -1
+TYPE_GENESIS = 0
+TYPE_ISSUE = 1
+TYPE_RETIRE = 2
+_TYPE_TAGS = {
+    'genesis': TYPE_GENESIS,
+    'hydrogen_credit_certificate': TYPE_ISSUE,
+    'certificate_retirement': TYPE_RETIRE,
+}
+
+
+def _search_nonces(prefix: bytes, suffix: bytes, difficulty: int,
+                   start: int, batch: int) -> Optional[Tuple[int, str]]:
+    """Try `batch` nonces from `start`; returns (nonce, hexdigest) on a hit
+
+    Structured as a standalone kernel over a nonce range so every name in
+    the trial loop is a local - the driver in mine_block just advances
+    `start` until a batch succeeds. The loop tests two nonces per
+    iteration, halving the range/branch overhead paid around each hash
+    (`batch` must therefore be even).
+
+    The proof-of-work test runs on the raw digest: `difficulty` hex
+    nibbles of leading zeros means 4*difficulty leading zero bits, which
+    (for difficulty <= 16) is one unsigned compare of the first 8 digest
+    bytes against a target derived from the difficulty. The target is a
+    loop constant, so each trial costs a single int comparison with no
+    slicing branches. Only the winning digest is converted to hex.
+
+    The nonce-independent prefix (the bulk of the block - its data dict
+    always exceeds one 64-byte SHA block) is absorbed into a base hasher
+    once; each trial then copies that midstate (a C-level memcpy) and
+    only feeds the nonce digits plus the short suffix through the
+    compression function, instead of rehashing the prefix every time.
+    """
+    base = hashlib.sha256(prefix)
+    copy = base.copy
+    from_bytes = int.from_bytes
+    if difficulty <= 16:
+        target = (1 << (64 - 4 * difficulty)) - 1
+        for nonce in range(start, start + batch, 2):
+            h = copy()
+            h.update(str(nonce).encode() + suffix)
+            digest = h.digest()
+            if from_bytes(digest[:8], 'big') <= target:
+                return nonce, digest.hex()
+            nonce += 1
+            h = copy()
+            h.update(str(nonce).encode() + suffix)
+            digest = h.digest()
+            if from_bytes(digest[:8], 'big') <= target:
+                return nonce, digest.hex()
+        return None
+
+    # Difficulties beyond 16 nibbles exceed the 64-bit window - fall back
+    # to the byte/nibble check (never hit with the configured difficulty)
+    k, odd_nibble = divmod(difficulty, 2)
+    zeros = b'\x00' * k
+    for nonce in range(start, start + batch):
+        h = copy()
+        h.update(str(nonce).encode() + suffix)
+        digest = h.digest()
+        if digest[:k] == zeros and (not odd_nibble or digest[k] < 16):
+            return nonce, digest.hex()
+    return None
 
 
 class Block:
     """Represents a single block in the blockchain"""
-    
+
+    # Slots drop the per-instance __dict__ - blocks are the chain's bulk
+    # allocation, so this shrinks each one and makes attribute loads a
+    # fixed-offset read during chain scans
+    __slots__ = ('index', 'timestamp', 'data', 'previous_hash', 'nonce',
+                 'hash', '_type_tag', '_canonical_cache', '_dict_cache')
+
     def __init__(self, index: int, timestamp: float, data: Dict, previous_hash: str, nonce: int = 0):
         self.index = index
         self.timestamp = timestamp
         self.data = data
         self.previous_hash = previous_hash
         self.nonce = nonce
+        self._type_tag = _TYPE_TAGS.get(data.get('type'), TYPE_OTHER)
+        self._canonical_cache = None  # (nonce, canonical bytes)
+        self._dict_cache = None  # (hash, to_dict() result)
         self.hash = self.calculate_hash()
-    
-    def calculate_hash(self) -> str:
-        """Calculate the hash of the current block"""
-        block_string = json.dumps({
+
+    def canonical_bytes(self) -> bytes:
+        """The exact bytes hashed for this block at its current nonce
+
+        Cached per nonce: a block is immutable once mined, so validation
+        passes reuse the serialization instead of re-running json.dumps.
+
+        This must stay on stdlib json: orjson formats floats and spacing
+        differently, which would change these bytes and therefore every
+        block hash. orjson is only used for the snapshot/journal files,
+        where the exact byte layout does not feed into hashes.
+        """
+        cached = self._canonical_cache
+        if cached is not None and cached[0] == self.nonce:
+            return cached[1]
+        block_bytes = json.dumps({
             'index': self.index,
             'timestamp': self.timestamp,
             'data': self.data,
             'previous_hash': self.previous_hash,
             'nonce': self.nonce
+        }, sort_keys=True, default=str).encode()
+        self._canonical_cache = (self.nonce, block_bytes)
+        return block_bytes
+
+    def calculate_hash(self) -> str:
+        """Calculate the hash of the current block"""
+        return hashlib.sha256(self.canonical_bytes()).hexdigest()
+
+    def hash_parts(self) -> Tuple[bytes, bytes]:
+        """Split the canonical serialization around the nonce for mining
+
+        Returns (prefix, suffix) bytes such that
+        ``sha256(prefix + str(nonce).encode() + suffix)`` equals
+        ``calculate_hash()`` for that nonce. With sort_keys the canonical
+        key order is data, index, nonce, previous_hash, timestamp, so the
+        nonce-independent parts only need to be serialized once per mine.
+        """
+        head = json.dumps({
+            'data': self.data,
+            'index': self.index
         }, sort_keys=True, default=str)
-        return hashlib.sha256(block_string.encode()).hexdigest()
-    
+        tail = json.dumps({
+            'previous_hash': self.previous_hash,
+            'timestamp': self.timestamp
+        }, sort_keys=True, default=str)
+        return (head[:-1] + ', "nonce": ').encode(), (', ' + tail[1:]).encode()
+
+
     def to_dict(self) -> Dict:
-        """Convert block to dictionary for serialization"""
-        return {
+        """Convert block to dictionary for serialization
+
+        Cached per hash: every snapshot save and get_chain call walks all
+        blocks, and a mined block never changes, so the dict is built once.
+        The guard compares the hash by identity - rebinding self.hash (as
+        the loaders do after construction) invalidates the cache, while
+        repeated calls on a settled block skip even the string compare.
+        """
+        cached = self._dict_cache
+        if cached is not None and cached[0] is self.hash:
+            return cached[1]
+        block_dict = {
             'index': self.index,
             'timestamp': self.timestamp,
             'data': self.data,
@@ -45,6 +245,8 @@ class Block:
             'nonce': self.nonce,
             'hash': self.hash
         }
+        self._dict_cache = (self.hash, block_dict)
+        return block_dict
 
 
 class GreenChain:
@@ -52,17 +254,209 @@ class GreenChain:
     
     def __init__(self, difficulty: int = 4, storage_file: str = "blockchain_data.json"):
         self.chain: List[Block] = []
+        # Parallel array of block timestamps. Blocks are appended in
+        # monotonic time order, so time-windowed queries can bisect for the
+        # first relevant block instead of scanning the whole chain. A typed
+        # double array keeps the comparisons on unboxed C doubles and costs
+        # 8 bytes per block instead of a PyFloat object each.
+        self._block_ts = array('d')
         self.difficulty = difficulty
         self.storage_file = storage_file
+        # Append-only ops journal (jsonl) written between full snapshots.
+        # The handle stays open so each append costs one write syscall
+        # instead of an open/write/close round-trip.
+        self.journal_file = storage_file + 'l'
+        self._journal_entries = 0
+        self._journal_fh = None
+        # Running hash over all block hashes (folded in append order) plus a
+        # small head file written with each snapshot, so a tampered or
+        # truncated snapshot is caught at load without rehashing every block
+        self.head_file = storage_file + '.head'
+        self._head_hash = ''
         self.certificates: Dict[str, Dict] = {}  # certificate_id -> certificate_data
         self.retired_certificates: set = set()
-        
+
+        # Reverse index: blockchain hash -> certificate_id, so hash lookups
+        # are O(1) instead of a scan over every certificate. Populated by
+        # load_blockchain and maintained on issue/import/reset.
+        self._hash_index: Dict[str, str] = {}
+
+        # Secondary query indexes so per-certificate and per-user lookups
+        # are O(result size) instead of a walk over the whole chain:
+        # certificate_id -> retirement block index, and seller_id -> list of
+        # issued certificate_ids (issuance block indexes already live in
+        # self.certificates). Maintained by _index_block on append and
+        # rebuilt wholesale on load/import.
+        self._retirement_blocks: Dict[str, int] = {}
+        self._user_issuances = defaultdict(list)
+
+        # One lowercased haystack string per certificate, built at index
+        # time, so a search is a single substring test per certificate
+        # instead of five .lower() allocations per block per query
+        self._search_haystacks: Dict[str, str] = {}
+
+        # Ready-made transaction summaries, one per issuance/retirement,
+        # built once at index time as (epoch float, summary dict) pairs.
+        # Blocks are immutable, so query methods hand out shallow copies
+        # instead of re-materializing the same 10-key dict from block.data
+        # on every call; the float is the sort key and lives outside the
+        # dict so it never leaks into returned payloads.
+        self._issuance_summaries: Dict[str, Tuple[float, Dict]] = {}
+        self._retirement_summaries: Dict[str, Tuple[float, Dict]] = {}
+
+        # Structure-of-arrays event columns (one row per issue/retire event,
+        # in append order) for aggregating consumers - typed buffers instead
+        # of per-transaction dicts
+        self._cols = self._new_cols()
+
+        # Incrementally maintained certificate aggregates (breakdown counters
+        # and token totals) so analytics reads are O(1); rebuilt on load/import
+        self._rebuild_cert_stats()
+
         # Load existing blockchain or create new one
         self.load_blockchain()
-        
+
         # Create genesis block if chain is empty
         if not self.chain:
             self.create_genesis_block()
+
+        # Number of leading blocks already validated; the chain is
+        # append-only, so is_chain_valid only checks blocks beyond this
+        self._validated_upto = 0
+
+    def _rebuild_hash_index(self) -> None:
+        """Rebuild the hash -> certificate_id reverse index"""
+        self._hash_index = {cert_info['hash']: cert_id for cert_id, cert_info in self.certificates.items()}
+
+    @staticmethod
+    def _new_cols() -> Dict:
+        """Fresh, empty structure-of-arrays event columns"""
+        return {
+            'ts': array('d'),
+            'block_idx': array('q'),
+            'type_tag': array('b'),
+            'tokens': array('d'),
+        }
+
+    def _fold_head(self, block_hash: str) -> None:
+        """Fold one appended block hash into the running head hash"""
+        self._head_hash = hashlib.sha256((self._head_hash + block_hash).encode()).hexdigest()
+
+    def _index_block(self, block: Block) -> None:
+        """Fold one appended block into the secondary query indexes"""
+        data = block.data
+        block_type = block._type_tag
+        if block_type == TYPE_ISSUE:
+            cert_id = data['certificate_id']
+            self._user_issuances[data.get('seller_id')].append(cert_id)
+            self._search_haystacks[cert_id] = '\x1f'.join((
+                data.get('facility_name') or '',
+                data.get('location') or '',
+                data.get('renewable_source') or '',
+                data.get('certification_type') or '',
+                str(cert_id)
+            )).lower()
+            # The timestamp parse happens once here; every query-time sort
+            # key is then a plain float read from the pair
+            ts = data.get('issued_at', block.timestamp)
+            ts_float = _timestamp_to_float(ts)
+            self._issuance_summaries[cert_id] = (ts_float, {
+                'type': 'certificate_issued',
+                'timestamp': ts,
+                'block_index': block.index,
+                'block_hash': block.hash,
+                'certificate_id': cert_id,
+                'seller_id': data.get('seller_id'),
+                'facility_name': data.get('facility_name'),
+                'hydrogen_weight_kg': data.get('hydrogen_weight_kg'),
+                'tokens_generated': data.get('tokens_generated'),
+                'renewable_source': data.get('renewable_source'),
+                'location': data.get('location'),
+                'certification_type': data.get('certification_type'),
+                'price_per_token': data.get('price_per_token'),
+                'status': 'issued'
+            })
+            cols = self._cols
+            cols['ts'].append(ts_float)
+            cols['block_idx'].append(block.index)
+            cols['type_tag'].append(TYPE_ISSUE)
+            cols['tokens'].append(float(data.get('tokens_generated') or 0))
+        elif block_type == TYPE_RETIRE:
+            cert_id = data['certificate_id']
+            self._retirement_blocks[cert_id] = block.index
+            cert_info = self.certificates.get(cert_id)
+            cert_data = cert_info['data'] if cert_info else {}
+            ts = data.get('retired_at', block.timestamp)
+            ts_float = _timestamp_to_float(ts)
+            self._retirement_summaries[cert_id] = (ts_float, {
+                'type': 'certificate_retired',
+                'timestamp': ts,
+                'block_index': block.index,
+                'block_hash': block.hash,
+                'certificate_id': cert_id,
+                'original_hash': data.get('original_hash'),
+                'reason': data.get('reason', 'Unknown'),
+                'facility_name': cert_data.get('facility_name'),
+                'tokens_generated': cert_data.get('tokens_generated'),
+                'renewable_source': cert_data.get('renewable_source'),
+                'status': 'retired'
+            })
+            cols = self._cols
+            cols['ts'].append(ts_float)
+            cols['block_idx'].append(block.index)
+            cols['type_tag'].append(TYPE_RETIRE)
+            cols['tokens'].append(float(cert_data.get('tokens_generated') or 0))
+
+    def _rebuild_indexes(self) -> None:
+        """Recompute the secondary query indexes from the chain"""
+        self._retirement_blocks = {}
+        self._user_issuances = defaultdict(list)
+        self._search_haystacks = {}
+        self._issuance_summaries = {}
+        self._retirement_summaries = {}
+        self._cols = self._new_cols()
+        for block in self.chain:
+            self._index_block(block)
+
+    def _stats_add(self, data: Dict) -> None:
+        """Fold one issued certificate into the running aggregates"""
+        self._by_source[data.get('renewable_source', 'unknown')] += 1
+        self._by_location[data.get('location', 'unknown')] += 1
+        self._by_cert_type[data.get('certification_type', 'unknown')] += 1
+        tokens = data.get('tokens_generated', 0)
+        self._total_tokens += tokens
+        self._total_price += tokens * data.get('price_per_token', 0.0)
+        self._active_tokens += tokens
+        issued_at = data.get('issued_at')
+        if issued_at:
+            ts = _timestamp_to_float(issued_at)
+            if self._first_issue is None or ts < self._first_issue[0]:
+                self._first_issue = (ts, issued_at)
+            if self._last_issue is None or ts > self._last_issue[0]:
+                self._last_issue = (ts, issued_at)
+
+    def _stats_retire(self, data: Dict) -> None:
+        """Move one certificate's tokens from active to retired"""
+        tokens = data.get('tokens_generated', 0)
+        self._active_tokens -= tokens
+        self._retired_tokens += tokens
+
+    def _rebuild_cert_stats(self) -> None:
+        """Recompute the incremental aggregates from the certificate store"""
+        self._by_source = Counter()
+        self._by_location = Counter()
+        self._by_cert_type = Counter()
+        self._total_tokens = 0
+        self._total_price = 0.0
+        self._active_tokens = 0
+        self._retired_tokens = 0
+        # Timeline bounds as (epoch float, original ISO string) pairs
+        self._first_issue = None
+        self._last_issue = None
+        for cert_info in self.certificates.values():
+            self._stats_add(cert_info['data'])
+            if cert_info['status'] == 'retired':
+                self._stats_retire(cert_info['data'])
     
     def create_genesis_block(self) -> None:
         """Create the first block in the chain"""
@@ -76,48 +470,159 @@ class GreenChain:
         
         genesis_block = Block(0, time.time(), genesis_data, "0")
         self.chain.append(genesis_block)
-        print("🌱 Genesis block created for Green Hydrogen Credit Blockchain Simulator")
+        self._block_ts.append(genesis_block.timestamp)
+        self._fold_head(genesis_block.hash)
+        logger.info("🌱 Genesis block created for Green Hydrogen Credit Blockchain Simulator")
         self.save_blockchain()
     
+    def _append_loaded_block(self, block_data: Dict) -> None:
+        """Rehydrate one serialized block onto the chain"""
+        block = Block(
+            index=block_data['index'],
+            timestamp=block_data['timestamp'],
+            data=block_data['data'],
+            previous_hash=block_data['previous_hash'],
+            nonce=block_data['nonce']
+        )
+        block.hash = block_data['hash']
+        self.chain.append(block)
+        self._block_ts.append(block.timestamp)
+        self._fold_head(block.hash)
+
+    def _load_snapshot(self) -> None:
+        """Read the snapshot file into the in-memory stores
+
+        With ijson available the chain (the bulk of the file) is streamed
+        block by block, so peak memory during load is the final object
+        graph rather than the fully parsed document plus that graph.
+        use_float keeps timestamps as floats - Decimals would change the
+        canonical block serialization and break hash validation.
+        """
+        self.chain = []
+        self._block_ts = array('d')
+        self._head_hash = ''
+        self._validated_upto = 0
+        if ijson is not None:
+            with open(self.storage_file, 'rb') as f:
+                for block_data in ijson.items(f, 'chain.item', use_float=True):
+                    self._append_loaded_block(block_data)
+            with open(self.storage_file, 'rb') as f:
+                self.certificates = dict(ijson.kvitems(f, 'certificates', use_float=True))
+            with open(self.storage_file, 'rb') as f:
+                self.retired_certificates = set(ijson.items(f, 'retired_certificates.item'))
+        else:
+            with open(self.storage_file, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            for block_data in data.get('chain', []):
+                self._append_loaded_block(block_data)
+            self.certificates = data.get('certificates', {})
+            self.retired_certificates = set(data.get('retired_certificates', []))
+
     def load_blockchain(self) -> None:
-        """Load blockchain data from JSON file"""
+        """Load blockchain data from the snapshot file plus the ops journal"""
         try:
             if os.path.exists(self.storage_file):
-                with open(self.storage_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Load chain
-                self.chain = []
-                for block_data in data.get('chain', []):
-                    block = Block(
-                        index=block_data['index'],
-                        timestamp=block_data['timestamp'],
-                        data=block_data['data'],
-                        previous_hash=block_data['previous_hash'],
-                        nonce=block_data['nonce']
-                    )
-                    block.hash = block_data['hash']
-                    self.chain.append(block)
-                
-                # Load certificates
-                self.certificates = data.get('certificates', {})
-                self.retired_certificates = set(data.get('retired_certificates', []))
-                
-                print(f"📂 Blockchain loaded from {self.storage_file}")
-                print(f"   - {len(self.chain)} blocks loaded")
-                print(f"   - {len(self.certificates)} certificates loaded")
-                print(f"   - {len(self.retired_certificates)} retired certificates")
-                
+                self._load_snapshot()
+
+                # Compare the folded head hash against the one written with
+                # the snapshot; a mismatch means corruption or tampering
+                if os.path.exists(self.head_file):
+                    with open(self.head_file, 'rb') as f:
+                        head = json.loads(f.read())
+                    if head.get('head_hash') != self._head_hash:
+                        raise ValueError("snapshot head hash mismatch")
+
+                logger.info("📂 Blockchain loaded from %s", self.storage_file)
+                logger.info("   - %d blocks loaded", len(self.chain))
+                logger.info("   - %d certificates loaded", len(self.certificates))
+                logger.info("   - %d retired certificates", len(self.retired_certificates))
+
             else:
-                print(f"📂 No existing blockchain found. Creating new one.")
-                
+                logger.info("📂 No existing blockchain found. Creating new one.")
+
+            # Apply operations journaled since the last full snapshot
+            replayed = self._replay_journal()
+            if replayed:
+                logger.info("📒 Replayed %d journaled operations from %s", replayed, self.journal_file)
+
+            self._intern_cert_values()
+            self._rebuild_hash_index()
+            self._rebuild_cert_stats()
+            self._rebuild_indexes()
+
         except Exception as e:
-            print(f"⚠️  Error loading blockchain: {e}")
-            print("   Creating new blockchain...")
+            logger.warning("⚠️  Error loading blockchain: %s", e)
+            logger.warning("   Creating new blockchain...")
             self.chain = []
+            self._block_ts = array('d')
+            self._head_hash = ''
+            self._validated_upto = 0
             self.certificates = {}
             self.retired_certificates = set()
-    
+            self._hash_index = {}
+            self._rebuild_cert_stats()
+            self._rebuild_indexes()
+
+    def _intern_cert_values(self) -> None:
+        """Deduplicate enum-like certificate strings loaded from disk"""
+        for cert_info in self.certificates.values():
+            data = cert_info['data']
+            for key in ('renewable_source', 'certification_type', 'location', 'status'):
+                value = data.get(key)
+                if isinstance(value, str):
+                    data[key] = sys.intern(value)
+
+    # Write a full snapshot after this many journal appends
+    SNAPSHOT_EVERY = 100
+
+    def _append_journal(self, entry: Dict) -> None:
+        """Append one operation to the jsonl journal - O(1) per event,
+        instead of rewriting the whole snapshot on every added block"""
+        if orjson is not None:
+            line = orjson.dumps(entry, default=str) + b'\n'
+        else:
+            line = (json.dumps(entry, default=str) + '\n').encode()
+        if self._journal_fh is None:
+            self._journal_fh = open(self.journal_file, 'ab')
+        self._journal_fh.write(line)
+        self._journal_fh.flush()
+        self._journal_entries += 1
+        if self._journal_entries >= self.SNAPSHOT_EVERY:
+            self.save_blockchain()
+
+    def _close_journal(self) -> None:
+        """Close the journal handle (before the snapshot truncates the file)"""
+        if self._journal_fh is not None:
+            self._journal_fh.close()
+            self._journal_fh = None
+
+    def _replay_journal(self) -> int:
+        """Apply journaled operations recorded since the last snapshot"""
+        if not os.path.exists(self.journal_file):
+            return 0
+        loads = orjson.loads if orjson is not None else json.loads
+        replayed = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = loads(line)
+                op = entry.get('op')
+                if op == 'block':
+                    self._append_loaded_block(entry['block'])
+                elif op == 'certificate':
+                    self.certificates[entry['certificate_id']] = entry['certificate']
+                elif op == 'retire':
+                    cert_id = entry['certificate_id']
+                    self.retired_certificates.add(cert_id)
+                    if cert_id in self.certificates:
+                        self.certificates[cert_id]['status'] = 'retired'
+                replayed += 1
+        self._journal_entries = replayed
+        return replayed
+
     def save_blockchain(self) -> None:
         """Save blockchain data to JSON file"""
         try:
@@ -131,13 +636,30 @@ class GreenChain:
                 'retired_count': len(self.retired_certificates)
             }
             
-            with open(self.storage_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            
-            print(f"💾 Blockchain saved to {self.storage_file}")
+            if orjson is not None:
+                payload = orjson.dumps(
+                    data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+                    default=str)
+            else:
+                payload = json.dumps(data, indent=2, default=str).encode()
+            with open(self.storage_file, 'wb') as f:
+                f.write(payload)
+            with open(self.head_file, 'wb') as f:
+                f.write(json.dumps({
+                    'total_blocks': len(self.chain),
+                    'head_hash': self._head_hash
+                }).encode())
+
+            # The snapshot now covers everything - reset the journal
+            self._close_journal()
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._journal_entries = 0
+
+            logger.info("💾 Blockchain saved to %s", self.storage_file)
             
         except Exception as e:
-            print(f"❌ Error saving blockchain: {e}")
+            logger.error("❌ Error saving blockchain: %s", e)
     
     def get_latest_block(self) -> Block:
         """Get the most recent block in the chain"""
@@ -149,24 +671,38 @@ class GreenChain:
         new_index = previous_block.index + 1 if previous_block else 0
         new_timestamp = time.time()
         new_block = Block(new_index, new_timestamp, data, previous_block.hash if previous_block else "0")
-        
-        # Simple proof of work (find hash starting with zeros)
-        while not new_block.hash.startswith('0' * self.difficulty):
-            new_block.nonce += 1
-            new_block.hash = new_block.calculate_hash()
-        
-        print(f"⛏️  Block {new_index} mined with hash: {new_block.hash[:16]}...")
+
+        # Simple proof of work (find hash starting with zeros). The
+        # nonce-independent JSON is serialized once; each trial only formats
+        # the nonce and hashes prefix + nonce + suffix, so the loop is
+        # compute-bound on SHA256 instead of on json.dumps. hashlib's OpenSSL
+        # core already picks the hardware SHA instructions where available.
+        prefix, suffix = new_block.hash_parts()
+        target = '0' * self.difficulty
+        if not new_block.hash.startswith(target):
+            found = None
+            start = new_block.nonce + 1
+            while found is None:
+                found = _search_nonces(prefix, suffix, self.difficulty, start, 1 << 14)
+                start += 1 << 14
+            new_block.nonce, new_block.hash = found
+        
+        logger.info("⛏️  Block %d mined with hash: %.16s...", new_index, new_block.hash)
         return new_block
     
     def add_block(self, block: Block) -> bool:
         """Add a new block to the chain after validation"""
         if self.is_valid_block(block):
             self.chain.append(block)
-            print(f"✅ Block {block.index} added to chain")
-            self.save_blockchain()  # Save after each block addition
+            self._block_ts.append(block.timestamp)
+            self._fold_head(block.hash)
+            self._index_block(block)
+            logger.info("✅ Block %d added to chain", block.index)
+            # Journal the new block instead of rewriting the whole snapshot
+            self._append_journal({'op': 'block', 'block': block.to_dict()})
             return True
         else:
-            print(f"❌ Block {block.index} validation failed")
+            logger.warning("❌ Block %d validation failed", block.index)
             return False
     
     def is_valid_block(self, block: Block) -> bool:
@@ -194,14 +730,26 @@ class GreenChain:
         return True
     
     def is_chain_valid(self) -> bool:
-        """Validate the entire blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            
-            if not self.is_valid_block(current_block):
+        """Validate the blockchain incrementally
+
+        Blocks validated once stay valid (the chain is append-only), so
+        only blocks appended since the last successful call are checked -
+        O(delta) per call instead of re-hashing the whole chain. The
+        tracker is zeroed whenever the chain is replaced wholesale
+        (load/import/reset), which forces one full pass.
+        """
+        # One tight pass with local bindings; the cheap link and
+        # proof-of-work checks run before the hash recomputation
+        chain = self.chain
+        target = '0' * self.difficulty
+        for i in range(max(self._validated_upto, 1), len(chain)):
+            block = chain[i]
+            if (block.previous_hash != chain[i - 1].hash
+                    or not block.hash.startswith(target)
+                    or block.hash != block.calculate_hash()):
                 return False
-        
+
+        self._validated_upto = len(chain)
         return True
     
     def issue_certificate(self, data: Dict) -> str:
@@ -214,13 +762,11 @@ class GreenChain:
         Returns:
             str: Unique hash of the issued certificate
         """
-        # Generate unique certificate ID
-        certificate_id = str(uuid.uuid4())
-        
-        # Check if certificate ID already exists (prevent duplicates)
-        if certificate_id in self.certificates:
-            raise Exception("Certificate ID already exists - duplicate detected")
-        
+        # Generate unique certificate ID - 128 bits of urandom, same
+        # collision odds as UUID4 without the UUID object construction and
+        # hyphenated formatting on every issue
+        certificate_id = os.urandom(16).hex()
+
         # Prepare certificate data
         certificate_data = {
             'type': 'hydrogen_credit_certificate',
@@ -229,10 +775,10 @@ class GreenChain:
             'facility_name': data.get('facility_name'),
             'hydrogen_weight_kg': data.get('hydrogen_weight_kg'),
             'tokens_generated': data.get('tokens_generated'),
-            'renewable_source': data.get('renewable_source'),
+            'renewable_source': _intern_if_str(data.get('renewable_source')),
             'production_date': data.get('production_date'),
-            'location': data.get('location'),
-            'certification_type': data.get('certification_type'),
+            'location': _intern_if_str(data.get('location')),
+            'certification_type': _intern_if_str(data.get('certification_type')),
             'price_per_token': data.get('price_per_token'),
             'status': 'issued',
             'issued_at': datetime.now(timezone.utc).isoformat(),
@@ -251,10 +797,17 @@ class GreenChain:
                 'data': certificate_data,
                 'status': 'active'
             }
-            
-            print(f"🎫 Certificate issued: {certificate_id}")
-            print(f"🔗 Blockchain hash: {new_block.hash}")
-            print(f"📊 Block #{new_block.index} added to chain")
+            self._hash_index[new_block.hash] = certificate_id
+            self._stats_add(certificate_data)
+            self._append_journal({
+                'op': 'certificate',
+                'certificate_id': certificate_id,
+                'certificate': self.certificates[certificate_id]
+            })
+
+            logger.info("🎫 Certificate issued: %s", certificate_id)
+            logger.info("🔗 Blockchain hash: %s", new_block.hash)
+            logger.info("📊 Block #%d added to chain", new_block.index)
             
             return new_block.hash
         else:
@@ -270,22 +823,29 @@ class GreenChain:
         Returns:
             Tuple[bool, Optional[Dict]]: (is_valid, certificate_data)
         """
-        # Find certificate by hash
-        for cert_id, cert_info in self.certificates.items():
-            if cert_info['hash'] == certificate_hash:
-                # Check if certificate is retired
-                if cert_id in self.retired_certificates:
-                    return False, {'error': 'Certificate has been retired/used', 'status': 'retired'}
-                
-                # Verify block exists in chain
-                if cert_info['block_index'] < len(self.chain):
-                    block = self.chain[cert_info['block_index']]
-                    if block.hash == certificate_hash:
-                        return True, cert_info['data']
-                
-                return False, {'error': 'Certificate not found in blockchain'}
-        
-        return False, {'error': 'Certificate not found'}
+        is_valid, cert_data, _status = self._verify_by_hash(certificate_hash)
+        return is_valid, cert_data
+
+    def _verify_by_hash(self, certificate_hash: str) -> Tuple[bool, Optional[Dict], str]:
+        """Verify one certificate via the hash index (O(1) instead of a scan)"""
+        cert_id = self._hash_index.get(certificate_hash)
+        if cert_id is None:
+            return False, {'error': 'Certificate not found'}, 'not_found'
+
+        cert_info = self.certificates[cert_id]
+
+        # The certificate record tracks its own status - no second lookup
+        # against the retired set needed
+        if cert_info['status'] == 'retired':
+            return False, {'error': 'Certificate has been retired/used', 'status': 'retired'}, 'retired'
+
+        # Verify block exists in chain
+        if cert_info['block_index'] < len(self.chain):
+            block = self.chain[cert_info['block_index']]
+            if block.hash == certificate_hash:
+                return True, cert_info['data'], 'active'
+
+        return False, {'error': 'Certificate not found in blockchain'}, 'active'
     
     def verify_certificate_by_id(self, certificate_id: str) -> Tuple[bool, Optional[Dict]]:
         """
@@ -301,9 +861,9 @@ class GreenChain:
             return False, {'error': 'Certificate ID not found'}
         
         cert_info = self.certificates[certificate_id]
-        
+
         # Check if certificate is retired
-        if certificate_id in self.retired_certificates:
+        if cert_info['status'] == 'retired':
             return False, {'error': 'Certificate has been retired/used', 'status': 'retired'}
         
         # Verify block exists in chain
@@ -314,6 +874,18 @@ class GreenChain:
         
         return False, {'error': 'Certificate not found in blockchain'}
     
+    def verify_certificates_bulk(self, certificate_hashes: List[str]) -> Dict[str, Tuple[bool, Optional[Dict], str]]:
+        """
+        Verify many certificates in a single pass over the certificate store
+
+        Args:
+            certificate_hashes: List of certificate hashes to verify
+
+        Returns:
+            Dict mapping hash -> (is_valid, certificate_data, status)
+        """
+        return {cert_hash: self._verify_by_hash(cert_hash) for cert_hash in set(certificate_hashes)}
+
     def retire_certificate(self, certificate_hash: str) -> bool:
         """
         Mark a certificate as used/retired (prevent double counting)
@@ -325,60 +897,61 @@ class GreenChain:
             bool: True if successfully retired, False otherwise
         """
         # Find certificate by hash
-        for cert_id, cert_info in self.certificates.items():
-            if cert_info['hash'] == certificate_hash:
-                if cert_id in self.retired_certificates:
-                    print(f"⚠️  Certificate {cert_id} already retired - cannot reuse")
-                    return False
-                
-                # Mark as retired
-                self.retired_certificates.add(cert_id)
-                self.certificates[cert_id]['status'] = 'retired'
-                
-                # Create retirement record
-                retirement_data = {
-                    'type': 'certificate_retirement',
-                    'certificate_id': cert_id,
-                    'original_hash': certificate_hash,
-                    'retired_at': datetime.now(timezone.utc).isoformat(),
-                    'status': 'retired',
-                    'reason': 'Certificate used for credit purchase'
-                }
-                
-                # Add retirement block to chain
-                retirement_block = self.mine_block(retirement_data)
-                if self.add_block(retirement_block):
-                    print(f"♻️  Certificate {cert_id} retired successfully")
-                    print(f"🔗 Retirement hash: {retirement_block.hash}")
-                    print(f"⚠️  Certificate cannot be reused (double counting prevention)")
-                    return True
-                else:
-                    print(f"❌ Failed to add retirement block for {cert_id}")
-                    return False
-        
-        print(f"❌ Certificate with hash {certificate_hash} not found")
-        return False
+        cert_id = self._hash_index.get(certificate_hash)
+        if cert_id is None:
+            logger.warning("❌ Certificate with hash %s not found", certificate_hash)
+            return False
+
+        if cert_id in self.retired_certificates:
+            logger.warning("⚠️  Certificate %s already retired - cannot reuse", cert_id)
+            return False
+
+        # Mark as retired
+        self.retired_certificates.add(cert_id)
+        self.certificates[cert_id]['status'] = 'retired'
+        self._stats_retire(self.certificates[cert_id]['data'])
+        self._append_journal({'op': 'retire', 'certificate_id': cert_id})
+
+        # Create retirement record
+        retirement_data = {
+            'type': 'certificate_retirement',
+            'certificate_id': cert_id,
+            'original_hash': certificate_hash,
+            'retired_at': datetime.now(timezone.utc).isoformat(),
+            'status': 'retired',
+            'reason': 'Certificate used for credit purchase'
+        }
+
+        # Add retirement block to chain
+        retirement_block = self.mine_block(retirement_data)
+        if self.add_block(retirement_block):
+            logger.info("♻️  Certificate %s retired successfully", cert_id)
+            logger.info("🔗 Retirement hash: %s", retirement_block.hash)
+            logger.info("⚠️  Certificate cannot be reused (double counting prevention)")
+            return True
+        else:
+            logger.error("❌ Failed to add retirement block for %s", cert_id)
+            return False
     
     def get_certificate_status(self, certificate_hash: str) -> str:
         """Get the current status of a certificate"""
-        for cert_id, cert_info in self.certificates.items():
-            if cert_info['hash'] == certificate_hash:
-                if cert_id in self.retired_certificates:
-                    return 'retired'
-                return 'active'
-        return 'not_found'
-    
+        cert_id = self._hash_index.get(certificate_hash)
+        if cert_id is None:
+            return 'not_found'
+        return 'retired' if self.certificates[cert_id]['status'] == 'retired' else 'active'
+
     def get_certificate_by_hash(self, certificate_hash: str) -> Optional[Dict]:
         """Get certificate data by its blockchain hash"""
-        for cert_id, cert_info in self.certificates.items():
-            if cert_info['hash'] == certificate_hash:
-                return {
-                    'certificate_id': cert_id,
-                    'hash': cert_info['hash'],
-                    'data': cert_info['data'],
-                    'status': 'retired' if cert_id in self.retired_certificates else 'active'
-                }
-        return None
+        cert_id = self._hash_index.get(certificate_hash)
+        if cert_id is None:
+            return None
+        cert_info = self.certificates[cert_id]
+        return {
+            'certificate_id': cert_id,
+            'hash': cert_info['hash'],
+            'data': cert_info['data'],
+            'status': 'retired' if cert_info['status'] == 'retired' else 'active'
+        }
     
     def get_chain(self) -> List[Dict]:
         """Get the full blockchain"""
@@ -408,67 +981,34 @@ class GreenChain:
         Returns:
             List of transaction records with timestamps
         """
-        transactions = []
-        
-        for block in self.chain:
-            if block.data.get('type') == 'hydrogen_credit_certificate':
-                transactions.append({
-                    'type': 'certificate_issued',
-                    'timestamp': block.data.get('issued_at', block.timestamp),
-                    'block_index': block.index,
-                    'block_hash': block.hash,
-                    'certificate_id': block.data.get('certificate_id'),
-                    'seller_id': block.data.get('seller_id'),
-                    'facility_name': block.data.get('facility_name'),
-                    'hydrogen_weight_kg': block.data.get('hydrogen_weight_kg'),
-                    'tokens_generated': block.data.get('tokens_generated'),
-                    'renewable_source': block.data.get('renewable_source'),
-                    'location': block.data.get('location'),
-                    'certification_type': block.data.get('certification_type'),
-                    'price_per_token': block.data.get('price_per_token'),
-                    'status': 'issued'
-                })
-            
-            elif block.data.get('type') == 'certificate_retirement':
-                transactions.append({
-                    'type': 'certificate_retired',
-                    'timestamp': block.data.get('retired_at', block.timestamp),
-                    'block_index': block.index,
-                    'block_hash': block.hash,
-                    'certificate_id': block.data.get('certificate_id'),
-                    'original_hash': block.data.get('original_hash'),
-                    'reason': block.data.get('reason', 'Unknown'),
-                    'status': 'retired'
-                })
-            
-            elif block.data.get('type') == 'genesis':
-                transactions.append({
-                    'type': 'genesis_block',
-                    'timestamp': block.timestamp,
-                    'block_index': block.index,
-                    'block_hash': block.hash,
-                    'message': block.data.get('message'),
-                    'version': block.data.get('version'),
-                    'status': 'created'
-                })
-        
-        # Sort by timestamp (newest first)
-        # Sort by timestamp (newest first) - handle mixed types
-        def safe_timestamp_sort(tx):
-            ts = tx['timestamp']
-            if isinstance(ts, str):
-                try:
-                    return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
-                except:
-                    return 0
-            elif isinstance(ts, (int, float)):
-                return ts
-            else:
-                return 0
-        
-        transactions.sort(key=safe_timestamp_sort, reverse=True)
-        
-        return transactions[:limit]
+        def iter_transactions():
+            # Hoist the summary dicts to locals - the loop body then runs on
+            # fast local loads instead of repeated self attribute lookups
+            issuances = self._issuance_summaries
+            retirements = self._retirement_summaries
+            for block in self.chain:
+                block_type = block._type_tag
+                if block_type == TYPE_ISSUE:
+                    yield issuances[block.data['certificate_id']]
+                elif block_type == TYPE_RETIRE:
+                    yield retirements[block.data['certificate_id']]
+                elif block_type == TYPE_GENESIS:
+                    yield (block.timestamp, {
+                        'type': 'genesis_block',
+                        'timestamp': block.timestamp,
+                        'block_index': block.index,
+                        'block_hash': block.hash,
+                        'message': block.data.get('message'),
+                        'version': block.data.get('version'),
+                        'status': 'created'
+                    })
+
+        # Top-N via a bounded heap: avoids materializing and fully sorting
+        # the whole history when limit << chain length. The summaries are
+        # shared cached (sort key, dict) pairs, so only the winners get
+        # copied and the sort key stays out of the returned dicts.
+        return [tx.copy() for _, tx in
+                heapq.nlargest(limit, iter_transactions(), key=itemgetter(0))]
     
     def get_certificate_transactions(self, certificate_id: str) -> List[Dict]:
         """
@@ -482,59 +1022,16 @@ class GreenChain:
         """
         if certificate_id not in self.certificates:
             return []
-        
-        transactions = []
-        cert_info = self.certificates[certificate_id]
-        
-        # Find issuance transaction
-        for block in self.chain:
-            if (block.data.get('type') == 'hydrogen_credit_certificate' and 
-                block.data.get('certificate_id') == certificate_id):
-                transactions.append({
-                    'type': 'certificate_issued',
-                    'timestamp': block.data.get('issued_at', block.timestamp),
-                    'block_index': block.index,
-                    'block_hash': block.hash,
-                    'facility_name': block.data.get('facility_name'),
-                    'hydrogen_weight_kg': block.data.get('hydrogen_weight_kg'),
-                    'tokens_generated': block.data.get('tokens_generated'),
-                    'renewable_source': block.data.get('renewable_source'),
-                    'location': block.data.get('location'),
-                    'certification_type': block.data.get('certification_type'),
-                    'price_per_token': block.data.get('price_per_token'),
-                    'status': 'issued'
-                })
-                break
-        
-        # Find retirement transaction
-        for block in self.chain:
-            if (block.data.get('type') == 'certificate_retirement' and 
-                block.data.get('certificate_id') == certificate_id):
-                transactions.append({
-                    'type': 'certificate_retired',
-                    'timestamp': block.data.get('retired_at', block.timestamp),
-                    'block_index': block.index,
-                    'block_hash': block.hash,
-                    'reason': block.data.get('reason', 'Unknown'),
-                    'status': 'retired'
-                })
-                break
-        
+
+        # Both summaries were prebuilt at index time - no chain scan
+        transactions = [self._issuance_summaries[certificate_id]]
+        retirement = self._retirement_summaries.get(certificate_id)
+        if retirement is not None:
+            transactions.append(retirement)
+
         # Sort by timestamp
-        def safe_timestamp_sort(tx):
-            ts = tx['timestamp']
-            if isinstance(ts, str):
-                try:
-                    return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
-                except:
-                    return 0
-            elif isinstance(ts, (int, float)):
-                return ts
-            else:
-                return 0
-        
-        transactions.sort(key=safe_timestamp_sort)
-        return transactions
+        transactions.sort(key=itemgetter(0))
+        return [tx.copy() for _, tx in transactions]
     
     def get_user_transactions(self, user_id: int) -> List[Dict]:
         """
@@ -547,61 +1044,26 @@ class GreenChain:
             List of all transactions involving this user
         """
         transactions = []
-        
-        for block in self.chain:
-            if block.data.get('type') == 'hydrogen_credit_certificate':
-                if block.data.get('seller_id') == user_id:
-                    transactions.append({
-                        'type': 'certificate_issued',
-                        'timestamp': block.data.get('issued_at', block.timestamp),
-                        'block_index': block.index,
-                        'block_hash': block.hash,
-                        'certificate_id': block.data.get('certificate_id'),
-                        'facility_name': block.data.get('facility_name'),
-                        'hydrogen_weight_kg': block.data.get('hydrogen_weight_kg'),
-                        'tokens_generated': block.data.get('tokens_generated'),
-                        'renewable_source': block.data.get('renewable_source'),
-                        'location': block.data.get('location'),
-                        'certification_type': block.data.get('certification_type'),
-                        'price_per_token': block.data.get('price_per_token'),
-                        'role': 'seller',
-                        'status': 'issued'
-                    })
-            
-            elif block.data.get('type') == 'certificate_retirement':
-                # Check if this retirement involves the user
-                cert_id = block.data.get('certificate_id')
-                if cert_id in self.certificates:
-                    cert_info = self.certificates[cert_id]
-                    if cert_info['data'].get('seller_id') == user_id:
-                        transactions.append({
-                            'type': 'certificate_retired',
-                            'timestamp': block.data.get('retired_at', block.timestamp),
-                            'block_index': block.index,
-                            'block_hash': block.hash,
-                            'certificate_id': cert_id,
-                            'facility_name': cert_info['data'].get('facility_name'),
-                            'tokens_generated': cert_info['data'].get('tokens_generated'),
-                            'renewable_source': cert_info['data'].get('renewable_source'),
-                            'role': 'seller',
-                            'status': 'retired'
-                        })
-        
+
+        # The user's certificates come straight from the seller index; each
+        # one contributes its prebuilt issuance summary plus its retirement
+        # summary if there is one - O(user's transactions), no chain scan
+        for cert_id in self._user_issuances.get(user_id, ()):
+            ts_float, issued = self._issuance_summaries[cert_id]
+            issued = issued.copy()
+            issued['role'] = 'seller'
+            transactions.append((ts_float, issued))
+
+            retired = self._retirement_summaries.get(cert_id)
+            if retired is not None:
+                ts_float, retired = retired
+                retired = retired.copy()
+                retired['role'] = 'seller'
+                transactions.append((ts_float, retired))
+
         # Sort by timestamp (newest first)
-        def safe_timestamp_sort(tx):
-            ts = tx['timestamp']
-            if isinstance(ts, str):
-                try:
-                    return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
-                except:
-                    return 0
-            elif isinstance(ts, (int, float)):
-                return ts
-            else:
-                return 0
-        
-        transactions.sort(key=safe_timestamp_sort, reverse=True)
-        return transactions
+        transactions.sort(key=itemgetter(0), reverse=True)
+        return [tx for _, tx in transactions]
     
     def get_blockchain_analytics(self) -> Dict:
         """
@@ -642,63 +1104,28 @@ class GreenChain:
             }
         }
         
-        # Calculate certificate breakdowns
-        total_price = 0.0
-        total_tokens = 0
-        
-        for cert_id, cert_info in self.certificates.items():
-            data = cert_info['data']
-            
-            # Source breakdown
-            source = data.get('renewable_source', 'unknown')
-            analytics['certificate_breakdown']['by_source'][source] = \
-                analytics['certificate_breakdown']['by_source'].get(source, 0) + 1
-            
-            # Location breakdown
-            location = data.get('location', 'unknown')
-            analytics['certificate_breakdown']['by_location'][location] = \
-                analytics['certificate_breakdown']['by_location'].get(location, 0) + 1
-            
-            # Certification type breakdown
-            cert_type = data.get('certification_type', 'unknown')
-            analytics['certificate_breakdown']['by_certification_type'][cert_type] = \
-                analytics['certificate_breakdown']['by_certification_type'].get(cert_type, 0) + 1
-            
-            # Token economics
-            tokens = data.get('tokens_generated', 0)
-            price = data.get('price_per_token', 0.0)
-            
-            total_tokens += tokens
-            total_price += (tokens * price)
-            
-            if cert_id not in self.retired_certificates:
-                analytics['token_economics']['active_tokens'] += tokens
-            else:
-                analytics['token_economics']['total_tokens_retired'] += tokens
-        
-        analytics['token_economics']['total_tokens_issued'] = total_tokens
-        if total_tokens > 0:
-            analytics['token_economics']['average_price_per_token'] = total_price / total_tokens
-        
-        # Timeline analysis
-        if self.certificates:
-            timestamps = []
-            for cert_info in self.certificates.values():
-                if 'issued_at' in cert_info['data']:
-                    try:
-                        timestamps.append(datetime.fromisoformat(cert_info['data']['issued_at']))
-                    except:
-                        pass
-            
-            if timestamps:
-                timestamps.sort()
-                analytics['timeline']['first_certificate'] = timestamps[0].isoformat()
-                analytics['timeline']['latest_certificate'] = timestamps[-1].isoformat()
-                
-                if len(timestamps) > 1:
-                    delta = timestamps[-1] - timestamps[0]
-                    analytics['timeline']['total_days_active'] = delta.days
-        
+        # Breakdowns and token economics are maintained incrementally on
+        # issue/retire, so reporting them is O(1) in certificate count
+        breakdown = analytics['certificate_breakdown']
+        breakdown['by_source'] = dict(self._by_source)
+        breakdown['by_location'] = dict(self._by_location)
+        breakdown['by_certification_type'] = dict(self._by_cert_type)
+
+        economics = analytics['token_economics']
+        economics['total_tokens_issued'] = self._total_tokens
+        economics['total_tokens_retired'] = self._retired_tokens
+        economics['active_tokens'] = self._active_tokens
+        if self._total_tokens > 0:
+            economics['average_price_per_token'] = self._total_price / self._total_tokens
+        
+        # Timeline bounds are tracked incrementally on issue, so this is a
+        # pair of lookups rather than a parse-and-sort over every certificate
+        if self._first_issue is not None:
+            timeline = analytics['timeline']
+            timeline['first_certificate'] = self._first_issue[1]
+            timeline['latest_certificate'] = self._last_issue[1]
+            timeline['total_days_active'] = int((self._last_issue[0] - self._first_issue[0]) // 86400)
+
         return analytics
     
     def get_recent_activity(self, hours: int = 24) -> List[Dict]:
@@ -713,345 +1140,52 @@ class GreenChain:
         """
         cutoff_time = datetime.now(timezone.utc).timestamp() - (hours * 3600)
         recent_transactions = []
-        
-        for block in self.chain:
-            if block.timestamp >= cutoff_time:
-                if block.data.get('type') == 'hydrogen_credit_certificate':
-                    recent_transactions.append({
-                        'type': 'certificate_issued',
-                        'timestamp': block.data.get('issued_at', block.timestamp),
-                        'block_index': block.index,
-                        'facility_name': block.data.get('facility_name'),
-                        'tokens_generated': block.data.get('tokens_generated'),
-                        'renewable_source': block.data.get('renewable_source'),
-                        'status': 'issued'
-                    })
-                elif block.data.get('type') == 'certificate_retirement':
-                    recent_transactions.append({
-                        'type': 'certificate_retired',
-                        'timestamp': block.data.get('retired_at', block.timestamp),
-                        'block_index': block.index,
-                        'certificate_id': block.data.get('certificate_id'),
-                        'status': 'retired'
-                    })
-        
-        # Sort by timestamp (newest first)
-        def safe_timestamp_sort(tx):
-            ts = tx['timestamp']
-            if isinstance(ts, str):
-                try:
-                    return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
-                except:
-                    return 0
-            elif isinstance(ts, (int, float)):
-                return ts
-            else:
-                return 0
-        
-        recent_transactions.sort(key=safe_timestamp_sort, reverse=True)
-        return recent_transactions
-    
-    def search_transactions(self, query: str) -> List[Dict]:
-        """
-        Search transactions by various criteria
-        
-        Args:
-            query: Search query (facility name, location, source, etc.)
-            
-        Returns:
-            List of matching transactions
-        """
-        query = query.lower()
-        matching_transactions = []
-        
-        for block in self.chain:
-            if block.data.get('type') == 'hydrogen_credit_certificate':
-                data = block.data
-                
-                # Search in various fields
-                if (query in data.get('facility_name', '').lower() or
-                    query in data.get('location', '').lower() or
-                    query in data.get('renewable_source', '').lower() or
-                    query in data.get('certification_type', '').lower() or
-                    query in str(data.get('certificate_id', '')).lower()):
-                    
-                    matching_transactions.append({
-                        'type': 'certificate_issued',
-                        'timestamp': data.get('issued_at', block.timestamp),
-                        'block_index': block.index,
-                        'block_hash': block.hash,
-                        'certificate_id': data.get('certificate_id'),
-                        'facility_name': data.get('facility_name'),
-                        'hydrogen_weight_kg': data.get('hydrogen_weight_kg'),
-                        'tokens_generated': data.get('tokens_generated'),
-                        'renewable_source': data.get('renewable_source'),
-                        'location': data.get('location'),
-                        'certification_type': data.get('certification_type'),
-                        'price_per_token': data.get('price_per_token'),
-                        'status': 'issued'
-                    })
-        
-        # Sort by timestamp (newest first)
-        def safe_timestamp_sort(tx):
-            ts = tx['timestamp']
-            if isinstance(ts, str):
-                try:
-                    return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
-                except:
-                    return 0
-            elif isinstance(ts, (int, float)):
-                return ts
-            else:
-                return 0
-        
-        matching_transactions.sort(key=safe_timestamp_sort, reverse=True)
-        return matching_transactions
-    
-    def get_certificate_transactions(self, certificate_id: str) -> List[Dict]:
-        """
-        Get all transactions for a specific certificate
-        
-        Args:
-            certificate_id: ID of the certificate
-            
-        Returns:
-            List of all transactions for this certificate
-        """
-        if certificate_id not in self.certificates:
-            return []
-        
-        transactions = []
-        cert_info = self.certificates[certificate_id]
-        
-        # Find issuance transaction
-        for block in self.chain:
-            if (block.data.get('type') == 'hydrogen_credit_certificate' and 
-                block.data.get('certificate_id') == certificate_id):
-                transactions.append({
-                    'type': 'certificate_issued',
-                    'timestamp': block.data.get('issued_at', block.timestamp),
-                    'block_index': block.index,
-                    'block_hash': block.hash,
-                    'facility_name': block.data.get('facility_name'),
-                    'hydrogen_weight_kg': block.data.get('hydrogen_weight_kg'),
-                    'tokens_generated': block.data.get('tokens_generated'),
-                    'renewable_source': block.data.get('renewable_source'),
-                    'location': block.data.get('location'),
-                    'certification_type': block.data.get('certification_type'),
-                    'price_per_token': block.data.get('price_per_token'),
-                    'status': 'issued'
-                })
-                break
-        
-        # Find retirement transaction
-        for block in self.chain:
-            if (block.data.get('type') == 'certificate_retirement' and 
-                block.data.get('certificate_id') == certificate_id):
-                transactions.append({
-                    'type': 'certificate_retired',
-                    'timestamp': block.data.get('retired_at', block.timestamp),
-                    'block_index': block.index,
-                    'block_hash': block.hash,
-                    'reason': block.data.get('reason', 'Unknown'),
-                    'status': 'retired'
-                })
-                break
-        
-        # Sort by timestamp
-        transactions.sort(key=lambda x: x['timestamp'])
-        return transactions
-    
-    def get_user_transactions(self, user_id: int) -> List[Dict]:
-        """
-        Get all transactions for a specific user
-        
-        Args:
-            user_id: ID of the user
-            
-        Returns:
-            List of all transactions involving this user
-        """
-        transactions = []
-        
-        for block in self.chain:
-            if block.data.get('type') == 'hydrogen_credit_certificate':
-                if block.data.get('seller_id') == user_id:
-                    transactions.append({
-                        'type': 'certificate_issued',
-                        'timestamp': block.data.get('issued_at', block.timestamp),
-                        'block_index': block.index,
-                        'block_hash': block.hash,
-                        'certificate_id': block.data.get('certificate_id'),
-                        'facility_name': block.data.get('facility_name'),
-                        'hydrogen_weight_kg': block.data.get('hydrogen_weight_kg'),
-                        'tokens_generated': block.data.get('tokens_generated'),
-                        'renewable_source': block.data.get('renewable_source'),
-                        'location': block.data.get('location'),
-                        'certification_type': block.data.get('certification_type'),
-                        'price_per_token': block.data.get('price_per_token'),
-                        'role': 'seller',
-                        'status': 'issued'
-                    })
-            
-            elif block.data.get('type') == 'certificate_retirement':
-                # Check if this retirement involves the user
-                cert_id = block.data.get('certificate_id')
-                if cert_id in self.certificates:
-                    cert_info = self.certificates[cert_id]
-                    if cert_info['data'].get('seller_id') == user_id:
-                        transactions.append({
-                            'type': 'certificate_retired',
-                            'timestamp': block.data.get('retired_at', block.timestamp),
-                            'block_index': block.index,
-                            'block_hash': block.hash,
-                            'certificate_id': cert_id,
-                            'facility_name': cert_info['data'].get('facility_name'),
-                            'tokens_generated': cert_info['data'].get('tokens_generated'),
-                            'renewable_source': cert_info['data'].get('renewable_source'),
-                            'role': 'seller',
-                            'status': 'retired'
-                        })
-        
+
+        # Blocks are in monotonic timestamp order, so bisect for the first
+        # block inside the window instead of scanning the whole chain
+        start = bisect_left(self._block_ts, cutoff_time)
+        issuances = self._issuance_summaries
+        retirements = self._retirement_summaries
+        append = recent_transactions.append
+        for block in self.chain[start:]:
+            block_type = block._type_tag
+            if block_type == TYPE_ISSUE:
+                append(issuances[block.data['certificate_id']])
+            elif block_type == TYPE_RETIRE:
+                append(retirements[block.data['certificate_id']])
+
         # Sort by timestamp (newest first)
-        transactions.sort(key=lambda x: x['timestamp'], reverse=True)
-        return transactions
-    
-    def get_blockchain_analytics(self) -> Dict:
-        """
-        Get comprehensive blockchain analytics and statistics
-        
-        Returns:
-            Dictionary with detailed analytics
-        """
-        analytics = {
-            'blockchain_summary': {
-                'total_blocks': len(self.chain),
-                'total_certificates': len(self.certificates),
-                'active_certificates': len(self.certificates) - len(self.retired_certificates),
-                'retired_certificates': len(self.retired_certificates),
-                'chain_valid': self.is_chain_valid(),
-                'difficulty': self.difficulty,
-                'last_block_time': self.get_latest_block().timestamp if self.chain else None
-            },
-            'certificate_breakdown': {
-                'by_source': {},
-                'by_location': {},
-                'by_certification_type': {},
-                'by_status': {
-                    'active': len(self.certificates) - len(self.retired_certificates),
-                    'retired': len(self.retired_certificates)
-                }
-            },
-            'token_economics': {
-                'total_tokens_issued': 0,
-                'total_tokens_retired': 0,
-                'active_tokens': 0,
-                'average_price_per_token': 0.0
-            },
-            'timeline': {
-                'first_certificate': None,
-                'latest_certificate': None,
-                'total_days_active': 0
-            }
-        }
-        
-        # Calculate certificate breakdowns
-        total_price = 0.0
-        total_tokens = 0
-        
-        for cert_id, cert_info in self.certificates.items():
-            data = cert_info['data']
-            
-            # Source breakdown
-            source = data.get('renewable_source', 'unknown')
-            analytics['certificate_breakdown']['by_source'][source] = \
-                analytics['certificate_breakdown']['by_source'].get(source, 0) + 1
-            
-            # Location breakdown
-            location = data.get('location', 'unknown')
-            analytics['certificate_breakdown']['by_location'][location] = \
-                analytics['certificate_breakdown']['by_location'].get(location, 0) + 1
-            
-            # Certification type breakdown
-            cert_type = data.get('certification_type', 'unknown')
-            analytics['certificate_breakdown']['by_certification_type'][cert_type] = \
-                analytics['certificate_breakdown']['by_certification_type'].get(cert_type, 0) + 1
-            
-            # Token economics
-            tokens = data.get('tokens_generated', 0)
-            price = data.get('price_per_token', 0.0)
-            
-            total_tokens += tokens
-            total_price += (tokens * price)
-            
-            if cert_id not in self.retired_certificates:
-                analytics['token_economics']['active_tokens'] += tokens
-            else:
-                analytics['token_economics']['total_tokens_retired'] += tokens
-        
-        analytics['token_economics']['total_tokens_issued'] = total_tokens
-        if total_tokens > 0:
-            analytics['token_economics']['average_price_per_token'] = total_price / total_tokens
-        
-        # Timeline analysis
-        if self.certificates:
-            timestamps = []
-            for cert_info in self.certificates.values():
-                if 'issued_at' in cert_info['data']:
-                    try:
-                        timestamps.append(datetime.fromisoformat(cert_info['data']['issued_at']))
-                    except:
-                        pass
-            
-            if timestamps:
-                timestamps.sort()
-                analytics['timeline']['first_certificate'] = timestamps[0].isoformat()
-                analytics['timeline']['latest_certificate'] = timestamps[-1].isoformat()
-                
-                if len(timestamps) > 1:
-                    delta = timestamps[-1] - timestamps[0]
-                    analytics['timeline']['total_days_active'] = delta.days
-        
-        return analytics
-    
-    def get_recent_activity(self, hours: int = 24) -> List[Dict]:
+        recent_transactions.sort(key=itemgetter(0), reverse=True)
+        return [tx.copy() for _, tx in recent_transactions]
+
+    def get_recent_activity_soa(self, hours: int = 24) -> Dict:
         """
-        Get recent blockchain activity within specified hours
-        
+        Columnar (structure-of-arrays) view of recent activity
+
+        Returns one typed array per column instead of a list of dicts, so
+        consumers that aggregate across many events (token sums, counts per
+        type) read contiguous buffers instead of chasing per-transaction
+        dict pointers. The arrays support the buffer protocol, so
+        numpy.frombuffer(...) can wrap each column without copying.
+
         Args:
             hours: Number of hours to look back
-            
+
         Returns:
-            List of recent transactions
+            Dict of parallel arrays: timestamps ('d'), block_indexes ('q'),
+            type_tags ('b', TYPE_ISSUE/TYPE_RETIRE) and tokens ('d'),
+            oldest first
         """
         cutoff_time = datetime.now(timezone.utc).timestamp() - (hours * 3600)
-        recent_transactions = []
-        
-        for block in self.chain:
-            if block.timestamp >= cutoff_time:
-                if block.data.get('type') == 'hydrogen_credit_certificate':
-                    recent_transactions.append({
-                        'type': 'certificate_issued',
-                        'timestamp': block.data.get('issued_at', block.timestamp),
-                        'block_index': block.index,
-                        'facility_name': block.data.get('facility_name'),
-                        'tokens_generated': block.data.get('tokens_generated'),
-                        'renewable_source': block.data.get('renewable_source'),
-                        'status': 'issued'
-                    })
-                elif block.data.get('type') == 'certificate_retirement':
-                    recent_transactions.append({
-                        'type': 'certificate_retired',
-                        'timestamp': block.data.get('retired_at', block.timestamp),
-                        'block_index': block.index,
-                        'certificate_id': block.data.get('certificate_id'),
-                        'status': 'retired'
-                    })
-        
-        # Sort by timestamp (newest first)
-        recent_transactions.sort(key=lambda x: x['timestamp'], reverse=True)
-        return recent_transactions
-    
+        cols = self._cols
+        start = bisect_left(cols['ts'], cutoff_time)
+        return {
+            'timestamps': cols['ts'][start:],
+            'block_indexes': cols['block_idx'][start:],
+            'type_tags': cols['type_tag'][start:],
+            'tokens': cols['tokens'][start:],
+        }
+
     def search_transactions(self, query: str) -> List[Dict]:
         """
         Search transactions by various criteria
@@ -1064,37 +1198,22 @@ class GreenChain:
         """
         query = query.lower()
         matching_transactions = []
-        
-        for block in self.chain:
-            if block.data.get('type') == 'hydrogen_credit_certificate':
-                data = block.data
-                
-                # Search in various fields
-                if (query in data.get('facility_name', '').lower() or
-                    query in data.get('location', '').lower() or
-                    query in data.get('renewable_source', '').lower() or
-                    query in data.get('certification_type', '').lower() or
-                    query in str(data.get('certificate_id', '')).lower()):
-                    
-                    matching_transactions.append({
-                        'type': 'certificate_issued',
-                        'timestamp': data.get('issued_at', block.timestamp),
-                        'block_index': block.index,
-                        'block_hash': block.hash,
-                        'certificate_id': data.get('certificate_id'),
-                        'facility_name': data.get('facility_name'),
-                        'hydrogen_weight_kg': data.get('hydrogen_weight_kg'),
-                        'tokens_generated': data.get('tokens_generated'),
-                        'renewable_source': data.get('renewable_source'),
-                        'location': data.get('location'),
-                        'certification_type': data.get('certification_type'),
-                        'price_per_token': data.get('price_per_token'),
-                        'status': 'issued'
-                    })
-        
+
+        # Most selective predicate first: an exact certificate-id query is
+        # a single dict lookup and skips the substring scan entirely
+        exact = self._issuance_summaries.get(query)
+        if exact is not None:
+            return [exact[1].copy()]
+
+        # One substring test against the prebuilt lowercase haystack per
+        # certificate replaces five per-field .lower() calls per block
+        for cert_id, haystack in self._search_haystacks.items():
+            if query in haystack:
+                matching_transactions.append(self._issuance_summaries[cert_id])
+
         # Sort by timestamp (newest first)
-        matching_transactions.sort(key=lambda x: x['timestamp'], reverse=True)
-        return matching_transactions
+        matching_transactions.sort(key=itemgetter(0), reverse=True)
+        return [tx.copy() for _, tx in matching_transactions]
     
     def get_certificate_history(self, certificate_id: str) -> List[Dict]:
         """Get the complete history of a certificate"""
@@ -1113,21 +1232,18 @@ class GreenChain:
             'block_index': cert_info['block_index']
         })
         
-        # Check if retired
-        if certificate_id in self.retired_certificates:
-            # Find retirement block
-            for block in self.chain:
-                if (block.data.get('type') == 'certificate_retirement' and 
-                    block.data.get('certificate_id') == certificate_id):
-                    history.append({
-                        'action': 'retired',
-                        'timestamp': block.data['retired_at'],
-                        'hash': block.hash,
-                        'block_index': block.index,
-                        'reason': block.data.get('reason', 'Unknown')
-                    })
-                    break
-        
+        # Check if retired - the reverse index points at the retirement block
+        retire_idx = self._retirement_blocks.get(certificate_id)
+        if retire_idx is not None:
+            block = self.chain[retire_idx]
+            history.append({
+                'action': 'retired',
+                'timestamp': block.data['retired_at'],
+                'hash': block.hash,
+                'block_index': block.index,
+                'reason': block.data.get('reason', 'Unknown')
+            })
+
         return history
     
     def export_chain(self) -> List[Dict]:
@@ -1138,6 +1254,9 @@ class GreenChain:
         """Import a blockchain from backup data"""
         try:
             self.chain = []
+            self._block_ts = array('d')
+            self._head_hash = ''
+            self._validated_upto = 0
             for block_data in chain_data:
                 block = Block(
                     index=block_data['index'],
@@ -1146,42 +1265,68 @@ class GreenChain:
                     previous_hash=block_data['previous_hash'],
                     nonce=block_data['nonce']
                 )
-                block.hash = block_data['hash']
+                # The constructor just recomputed the hash from the canonical
+                # bytes - compare instead of trusting the supplied value, and
+                # abort on the first tampered or corrupted block. Each block
+                # is serialized and fed to SHA-256 exactly once here, and the
+                # canonical bytes stay cached on the block, so later
+                # is_chain_valid passes hash without re-serializing.
+                if block.hash != block_data['hash']:
+                    logger.error("❌ Hash mismatch at block %s - import aborted", block_data['index'])
+                    return False
                 self.chain.append(block)
-            
+                self._block_ts.append(block.timestamp)
+                self._fold_head(block.hash)
+
             # Rebuild certificates and retired sets
             self.certificates = {}
             self.retired_certificates = set()
             
             for block in self.chain:
-                if block.data.get('type') == 'hydrogen_credit_certificate':
-                    cert_id = block.data['certificate_id']
+                tag = block._type_tag
+                data = block.data
+                if tag == TYPE_ISSUE:
+                    cert_id = data['certificate_id']
                     self.certificates[cert_id] = {
                         'hash': block.hash,
                         'block_index': block.index,
-                        'data': block.data,
+                        'data': data,
                         'status': 'active'
                     }
-                elif block.data.get('type') == 'certificate_retirement':
-                    self.retired_certificates.add(block.data['certificate_id'])
-                    if block.data['certificate_id'] in self.certificates:
-                        self.certificates[block.data['certificate_id']]['status'] = 'retired'
+                elif tag == TYPE_RETIRE:
+                    cert_id = data['certificate_id']
+                    self.retired_certificates.add(cert_id)
+                    if cert_id in self.certificates:
+                        self.certificates[cert_id]['status'] = 'retired'
             
-            print(f"✅ Blockchain imported successfully with {len(self.chain)} blocks")
+            self._rebuild_hash_index()
+            self._rebuild_indexes()
+
+            logger.info("✅ Blockchain imported successfully with %d blocks", len(self.chain))
             self.save_blockchain()
             return True
             
         except Exception as e:
-            print(f"❌ Failed to import blockchain: {e}")
+            logger.error("❌ Failed to import blockchain: %s", e)
             return False
     
     def reset_blockchain(self) -> None:
         """Reset blockchain to initial state (for testing)"""
         self.chain = []
+        self._block_ts = array('d')
+        self._head_hash = ''
+        self._validated_upto = 0
         self.certificates = {}
         self.retired_certificates = set()
+        self._hash_index = {}
+        self._retirement_blocks = {}
+        self._user_issuances = defaultdict(list)
+        self._search_haystacks = {}
+        self._issuance_summaries = {}
+        self._retirement_summaries = {}
+        self._cols = self._new_cols()
         self.create_genesis_block()
-        print("🔄 Blockchain reset to initial state")
+        logger.info("🔄 Blockchain reset to initial state")
 
 
 # Global blockchain instance
@@ -1194,7 +1339,8 @@ def get_blockchain() -> GreenChain:
 
 
 if __name__ == "__main__":
-    # Test the blockchain simulator
+    # Test the blockchain simulator (show the library's log output too)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("🧪 Testing Green Hydrogen Credit Blockchain Simulator...")
     
     # Test certificate issuance
@@ -7,264 +7,525 @@ Provides live blockchain events, WebSocket connections, and real-time data synch
 import asyncio
 import json
 import time
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timezone
+from itertools import islice
 from typing import Dict, List, Optional, Callable, Any
 from flask_socketio import SocketIO, emit, join_room, leave_room
+import sys
 import threading
 import queue
 import logging
 
-# Optional Web3 import for real blockchain integration
+# Optional orjson (C extension) - encodes history slices several times
+# faster than stdlib json
 try:
-    from web3 import Web3
-    from web3.middleware import geth_poa_middleware
-    WEB3_AVAILABLE = True
+    import orjson
 except ImportError:
-    WEB3_AVAILABLE = False
-    print("⚠️ Web3 not available - using local blockchain only")
+    orjson = None
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# (second, formatted prefix) pair kept as one tuple so concurrent reads
+# always see a matching second/prefix combination
+_iso_cache = (-1, '')
+
+
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO-8601 string
+
+    Formatting an aware datetime is the priciest part of building an
+    event; callers compute this once per event and reuse it for every
+    timestamp field instead of re-reading and re-formatting the clock.
+
+    The wire format has to stay ISO-8601 (the dashboard feeds it to
+    JavaScript's Date), so internally this works from a single
+    time.time() read: the date-and-second prefix is formatted once per
+    wall-clock second and cached, and only the microsecond fraction is
+    composed per call.
+    """
+    global _iso_cache
+    now = time.time()
+    sec = int(now)
+    cached_sec, prefix = _iso_cache
+    if sec != cached_sec:
+        # isoformat() on a whole second has no fraction; drop the +00:00
+        # suffix so the fraction can be spliced in before it
+        prefix = datetime.fromtimestamp(sec, timezone.utc).isoformat()[:-6]
+        _iso_cache = (sec, prefix)
+    return '%s.%06d+00:00' % (prefix, int((now - sec) * 1000000))
+
+
+# Routing constants interned once and shared by every event, so the
+# room dispatch in _broadcast_event compares against the same object
+_ROOM_BLOCKCHAIN = sys.intern('blockchain')
+_ROOM_BROADCAST = sys.intern('broadcast')
+
+
+def _make_event(event_type: str, data: Dict, room: str = _ROOM_BLOCKCHAIN,
+                timestamp: str = None) -> Dict:
+    """Assemble the standard event envelope shared by the emit_* methods"""
+    return {
+        'type': event_type,
+        'timestamp': timestamp or _utcnow_iso(),
+        'data': data,
+        'room': room
+    }
+
+
 class RealTimeBlockchain:
     """Real-time blockchain integration with live event streaming"""
     
     def __init__(self, socketio: SocketIO, web3_provider: str = None):
         self.socketio = socketio
-        self.event_queue = queue.Queue()
+        # Bounded so a broadcast storm cannot grow the process without
+        # limit; on overflow the oldest queued event is dropped (see
+        # _publish) and the drop is counted in the live statistics
+        self.event_queue = queue.Queue(maxsize=16384)
+        self._dropped_events = 0
         self.subscribers = {}
         self.live_connections = {}
-        self.blockchain_events = []
+        # Last-activity kept as epoch floats in a parallel dict; cleanup
+        # then compares floats instead of parsing ISO strings per user
+        self._last_activity = {}
+        # Bounded ring buffer: the deque evicts the oldest event in O(1)
+        # instead of periodically re-slicing a list copy
+        self.blockchain_events = deque(maxlen=1000)
+        # Per-type view of the same history records, so filtered queries
+        # read only matching events instead of scanning the whole ring
+        self._events_by_type = defaultdict(lambda: deque(maxlen=1000))
+
+        # Short-TTL statistics cache so polling storms share one computation
+        self._stats_cache = None
+        self._stats_cache_time = 0.0
+        self._stats_cache_ttl = 0.5
+
+        # Event-history memo shared by all subscribers requesting the same slice
+        self._history_cache = {}
+
+        # Incrementally maintained per-type event counters (O(1) statistics)
+        self._event_type_counts = Counter()
+
+        # Subscription index: event type -> set of socket session ids, so
+        # publishing an event is a set lookup instead of a scan over clients
+        self._subs = {}
+        self._sid_types = {}
+
+        # Optional BlockchainEventManager, wired up by
+        # init_realtime_blockchain; events are dispatched to its handlers
+        # inline on the consumer pass instead of through a second queue
+        self.event_manager = None
         
-        # Web3 integration (optional - for real blockchain)
-        if web3_provider and WEB3_AVAILABLE:
+        # Web3 integration (optional - for real blockchain). Imported
+        # lazily because web3 drags in eth-utils/eth-abi/hexbytes at
+        # import time; the common no-provider path never pays that cost.
+        self.web3 = None
+        self.is_connected = False
+        if web3_provider:
             try:
-                self.web3 = Web3(Web3.HTTPProvider(web3_provider))
-                self.web3.middleware_onion.inject(geth_poa_middleware, layer=0)
-                self.is_connected = self.web3.is_connected()
-            except Exception as e:
-                logger.warning(f"Web3 initialization failed: {e}")
-                self.web3 = None
-                self.is_connected = False
-        else:
-            self.web3 = None
-            self.is_connected = False
+                from web3 import Web3
+                from web3.middleware import geth_poa_middleware
+            except ImportError:
+                logger.warning("⚠️ Web3 not available - using local blockchain only")
+            else:
+                try:
+                    self.web3 = Web3(Web3.HTTPProvider(web3_provider))
+                    self.web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+                    self.is_connected = self.web3.is_connected()
+                except Exception as e:
+                    logger.warning("Web3 initialization failed: %s", e)
+                    self.web3 = None
+                    self.is_connected = False
         
-        # Start event processing thread
+        # Start event processing on the server's own async model: under
+        # eventlet/gevent start_background_task runs the consumer as a
+        # cooperatively scheduled green thread, so emits take the
+        # non-blocking I/O path instead of crossing from a native thread.
+        # Plain threading remains the fallback (threading async mode, or
+        # the mock socketio used by the self-test below).
         self.running = True
-        self.event_thread = threading.Thread(target=self._process_events, daemon=True)
-        self.event_thread.start()
+        start_task = getattr(socketio, 'start_background_task', None)
+        if start_task is not None:
+            self.event_thread = start_task(self._process_events)
+        else:
+            self.event_thread = threading.Thread(target=self._process_events, daemon=True)
+            self.event_thread.start()
         
         logger.info("🚀 Real-time blockchain system initialized")
     
+    # How many queued events one wakeup may drain; bursts pay the queue
+    # lock and condition-variable wake once per batch instead of per event
+    BATCH_MAX = 64
+
     def _process_events(self):
-        """Background thread for processing blockchain events"""
+        """Background thread for processing blockchain events
+
+        Blocks on the queue so events are handled the moment they arrive
+        instead of being polled every 100 ms, then drains whatever else
+        is already queued (up to BATCH_MAX) without further waits.
+        `stop()` enqueues a None sentinel to wake the thread for a
+        prompt shutdown.
+        """
         while self.running:
             try:
-                if not self.event_queue.empty():
-                    event = self.event_queue.get(timeout=1)
+                event = self.event_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if event is None:
+                break
+            batch = [event]
+            get_nowait = self.event_queue.get_nowait
+            while len(batch) < self.BATCH_MAX:
+                try:
+                    event = get_nowait()
+                except queue.Empty:
+                    break
+                if event is None:
+                    self.running = False
+                    break
+                batch.append(event)
+            for event in batch:
+                try:
                     self._broadcast_event(event)
-                time.sleep(0.1)
+                except Exception as e:
+                    logger.error("Error processing blockchain events: %s", e)
+
+            # Refresh dashboards without each client having to poll -
+            # coalesced to one statistics frame per drained batch, so a
+            # burst of N events no longer pushes N statistics updates
+            try:
+                self.broadcast_statistics()
             except Exception as e:
-                logger.error(f"Error processing blockchain events: {e}")
+                logger.error("Error broadcasting statistics update: %s", e)
     
     def _broadcast_event(self, event: Dict):
         """Broadcast blockchain event to all connected clients"""
         try:
             event_type = event.get('type')
-            room = event.get('room', 'blockchain')
-            
+            room = event.get('room', _ROOM_BLOCKCHAIN)
+
             # Emit to specific room or broadcast
-            if room == 'broadcast':
+            if room == _ROOM_BROADCAST:
                 self.socketio.emit('blockchain_event', event, namespace='/blockchain')
             else:
-                self.socketio.emit('blockchain_event', event, room=room, namespace='/blockchain')
-            
-            # Store event for history
-            self.blockchain_events.append({
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'event': event
-            })
+                # Targeted fan-out via the subscription index when clients
+                # have registered; room broadcast as the fallback. Only
+                # union when both sides are non-empty so the common case
+                # allocates no throwaway sets
+                typed = self._subs.get(event_type)
+                wildcard = self._subs.get('all')
+                if typed and wildcard:
+                    targets = typed | wildcard
+                else:
+                    targets = typed or wildcard
+                if targets:
+                    self.broadcast_batched('blockchain_event', event, list(targets))
+                else:
+                    self.socketio.emit('blockchain_event', event, room=room, namespace='/blockchain')
             
-            # Keep only last 1000 events
-            if len(self.blockchain_events) > 1000:
-                self.blockchain_events = self.blockchain_events[-1000:]
-                
+            self._record_event(event)
+
+            # Route to registered handlers on the same pass, while the
+            # event is hot - no second queue hop
+            if self.event_manager is not None:
+                self.event_manager.handle_event(event)
+
         except Exception as e:
-            logger.error(f"Error broadcasting blockchain event: {e}")
-    
+            logger.error("Error broadcasting blockchain event: %s", e)
+
+    def _record_event(self, event: Dict):
+        """Append an event to the bounded history, keeping counters in sync"""
+        event_type = event.get('type')
+        # The deque is full once it reaches maxlen, so account for the
+        # record it is about to evict
+        events = self.blockchain_events
+        if len(events) == events.maxlen:
+            dropped_type = events[0][1]
+            self._event_type_counts[dropped_type] -= 1
+            # The globally oldest record is also the oldest of its type,
+            # so the per-type view drops it in the same step - filtered
+            # history never outlives the main ring or the counters
+            self._events_by_type[dropped_type].popleft()
+        # Stored as a plain (timestamp, type, event) tuple: no wrapper
+        # dict per record, and eviction reads the type by index instead
+        # of two dict probes. The dict shape the callers expect is
+        # rebuilt lazily in get_event_history / get_live_statistics.
+        record = (event.get('timestamp') or _utcnow_iso(), event_type, event)
+        events.append(record)
+        self._events_by_type[event_type].append(record)
+        self._event_type_counts[event_type] += 1
+
+        # New event invalidates the cached statistics/history
+        self._stats_cache = None
+        self._history_cache.clear()
+
+    def _publish(self, event: Dict):
+        """Queue an event for broadcast, or just record it when nobody listens
+
+        With no connected clients there is nothing to emit, so the event
+        skips the queue and consumer wakeup entirely and goes straight
+        into the history ring - bulk issuance with an idle dashboard
+        pays only the history append.
+        """
+        if not self.live_connections:
+            self._record_event(event)
+            return
+        try:
+            self.event_queue.put_nowait(event)
+        except queue.Full:
+            # Overloaded consumer: these are telemetry-style events, so
+            # evict the oldest to make room and keep the fresh one
+            try:
+                self.event_queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.event_queue.put_nowait(event)
+            except queue.Full:
+                pass
+            self._dropped_events += 1
+    
+    def broadcast_batched(self, event_name: str, payload: Any, sids: List[str], batch_size: int = 50):
+        """Emit to many clients in chunks, yielding to the event loop between chunks"""
+        for i, sid in enumerate(sids):
+            self.socketio.emit(event_name, payload, to=sid, namespace='/blockchain')
+            if (i + 1) % batch_size == 0:
+                self.socketio.sleep(0)
+
+    def broadcast_statistics(self):
+        """Push current live statistics to every connected client
+
+        A single room emit lets the Socket.IO server encode the packet
+        once and fan the same frame out to every member, instead of
+        re-serializing the stats dict per session id.
+        """
+        if not self.live_connections:
+            return
+        stats = self.get_live_statistics()
+        self.socketio.emit('statistics_update', stats, room=_ROOM_BLOCKCHAIN, namespace='/blockchain')
+
     def emit_certificate_issued(self, certificate_data: Dict, blockchain_hash: str):
         """Emit real-time event when certificate is issued"""
-        event = {
-            'type': 'certificate_issued',
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'data': {
-                'certificate_id': certificate_data.get('certificate_id'),
-                'blockchain_hash': blockchain_hash,
-                'seller_id': certificate_data.get('seller_id'),
-                'facility_name': certificate_data.get('facility_name'),
-                'tokens_generated': certificate_data.get('tokens_generated'),
-                'renewable_source': certificate_data.get('renewable_source'),
-                'status': 'issued'
-            },
-            'room': 'blockchain'
-        }
+        event = _make_event('certificate_issued', {
+            'certificate_id': certificate_data.get('certificate_id'),
+            'blockchain_hash': blockchain_hash,
+            'seller_id': certificate_data.get('seller_id'),
+            'facility_name': certificate_data.get('facility_name'),
+            'tokens_generated': certificate_data.get('tokens_generated'),
+            'renewable_source': certificate_data.get('renewable_source'),
+            'status': 'issued'
+        })
         
-        self.event_queue.put(event)
-        logger.info(f"🎫 Real-time certificate issued event: {blockchain_hash[:16]}...")
+        self._publish(event)
+        logger.info("🎫 Real-time certificate issued event: %.16s...", blockchain_hash)
     
     def emit_certificate_verified(self, certificate_data: Dict, verified_by: str):
         """Emit real-time event when certificate is verified"""
-        event = {
-            'type': 'certificate_verified',
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'data': {
-                'certificate_id': certificate_data.get('certificate_id'),
-                'blockchain_hash': certificate_data.get('blockchain_hash'),
-                'verified_by': verified_by,
-                'status': 'verified',
-                'verified_at': datetime.now(timezone.utc).isoformat()
-            },
-            'room': 'blockchain'
-        }
+        now_iso = _utcnow_iso()
+        event = _make_event('certificate_verified', {
+            'certificate_id': certificate_data.get('certificate_id'),
+            'blockchain_hash': certificate_data.get('blockchain_hash'),
+            'verified_by': verified_by,
+            'status': 'verified',
+            'verified_at': now_iso
+        }, timestamp=now_iso)
         
-        self.event_queue.put(event)
-        logger.info(f"✅ Real-time certificate verified event: {certificate_data.get('certificate_id')}")
+        self._publish(event)
+        logger.info("✅ Real-time certificate verified event: %s", certificate_data.get('certificate_id'))
     
     def emit_certificate_traded(self, trade_data: Dict):
         """Emit real-time event when certificate is traded"""
-        event = {
-            'type': 'certificate_traded',
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'data': {
-                'certificate_id': trade_data.get('certificate_id'),
-                'blockchain_hash': trade_data.get('blockchain_hash'),
-                'seller_id': trade_data.get('seller_id'),
-                'buyer_id': trade_data.get('buyer_id'),
-                'tokens_amount': trade_data.get('tokens_amount'),
-                'price_per_token': trade_data.get('price_per_token'),
-                'total_amount': trade_data.get('total_amount'),
-                'status': 'traded'
-            },
-            'room': 'blockchain'
-        }
+        event = _make_event('certificate_traded', {
+            'certificate_id': trade_data.get('certificate_id'),
+            'blockchain_hash': trade_data.get('blockchain_hash'),
+            'seller_id': trade_data.get('seller_id'),
+            'buyer_id': trade_data.get('buyer_id'),
+            'tokens_amount': trade_data.get('tokens_amount'),
+            'price_per_token': trade_data.get('price_per_token'),
+            'total_amount': trade_data.get('total_amount'),
+            'status': 'traded'
+        })
         
-        self.event_queue.put(event)
-        logger.info(f"💰 Real-time certificate traded event: {trade_data.get('certificate_id')}")
+        self._publish(event)
+        logger.info("💰 Real-time certificate traded event: %s", trade_data.get('certificate_id'))
     
     def emit_certificate_retired(self, certificate_data: Dict):
         """Emit real-time event when certificate is retired"""
-        event = {
-            'type': 'certificate_retired',
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'data': {
-                'certificate_id': certificate_data.get('certificate_id'),
-                'blockchain_hash': certificate_data.get('blockchain_hash'),
-                'retired_at': datetime.now(timezone.utc).isoformat(),
-                'status': 'retired'
-            },
-            'room': 'blockchain'
-        }
+        now_iso = _utcnow_iso()
+        event = _make_event('certificate_retired', {
+            'certificate_id': certificate_data.get('certificate_id'),
+            'blockchain_hash': certificate_data.get('blockchain_hash'),
+            'retired_at': now_iso,
+            'status': 'retired'
+        }, timestamp=now_iso)
         
-        self.event_queue.put(event)
-        logger.info(f"♻️ Real-time certificate retired event: {certificate_data.get('certificate_id')}")
+        self._publish(event)
+        logger.info("♻️ Real-time certificate retired event: %s", certificate_data.get('certificate_id'))
     
     def emit_blockchain_update(self, update_data: Dict):
         """Emit general blockchain update"""
-        event = {
-            'type': 'blockchain_update',
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'data': update_data,
-            'room': 'broadcast'
-        }
+        event = _make_event('blockchain_update', update_data, room=_ROOM_BROADCAST)
         
-        self.event_queue.put(event)
-        logger.info(f"📊 Real-time blockchain update: {update_data.get('type', 'unknown')}")
+        self._publish(event)
+        logger.info("📊 Real-time blockchain update: %s", update_data.get('type', 'unknown'))
     
     def get_live_statistics(self) -> Dict:
-        """Get real-time blockchain statistics"""
-        return {
+        """Get real-time blockchain statistics (cached for a short TTL)"""
+        now = time.monotonic()
+        if self._stats_cache is not None and now - self._stats_cache_time < self._stats_cache_ttl:
+            return self._stats_cache
+
+        if self.blockchain_events:
+            timestamp, _, event = self.blockchain_events[-1]
+            last_event = {'timestamp': timestamp, 'event': event}
+        else:
+            last_event = None
+
+        stats = {
             'total_events': len(self.blockchain_events),
             'active_connections': len(self.live_connections),
-            'last_event': self.blockchain_events[-1] if self.blockchain_events else None,
+            'last_event': last_event,
             'web3_connected': self.is_connected,
-            'event_types': self._get_event_type_counts()
+            'event_types': self._get_event_type_counts(),
+            'dropped_events': self._dropped_events
         }
+        self._stats_cache = stats
+        self._stats_cache_time = now
+        return stats
     
     def _get_event_type_counts(self) -> Dict:
-        """Count events by type"""
-        counts = {}
-        for event_record in self.blockchain_events:
-            event_type = event_record['event'].get('type')
-            counts[event_type] = counts.get(event_type, 0) + 1
-        return counts
+        """Count events by type (maintained incrementally on append/evict)"""
+        return dict(self._event_type_counts)
     
     def get_event_history(self, event_type: str = None, limit: int = 100) -> List[Dict]:
-        """Get blockchain event history"""
-        events = self.blockchain_events
-        
-        if event_type:
-            events = [e for e in events if e['event'].get('type') == event_type]
-        
-        return events[-limit:] if events else []
-    
-    def subscribe_to_events(self, user_id: str, event_types: List[str] = None):
+        """Get blockchain event history (memoized until a new event arrives)"""
+        cache_key = (event_type, limit)
+        cached = self._history_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # .get so querying an unseen type cannot grow the defaultdict
+        # with empty deques keyed on caller-supplied input
+        events = self._events_by_type.get(event_type, ()) if event_type else self.blockchain_events
+        result = [{'timestamp': timestamp, 'event': event}
+                  for timestamp, _, event in islice(events, max(0, len(events) - limit), len(events))]
+        self._history_cache[cache_key] = result
+        return result
+
+    def get_event_history_json(self, event_type: str = None, limit: int = 100) -> str:
+        """Event history pre-encoded as a JSON array string
+
+        Encode-once, serve-many: the encoded body is memoized alongside
+        the slice itself and reused verbatim for every late-joiner or
+        polling request until the next event invalidates it, so handlers
+        returning raw JSON never re-serialize an unchanged history.
+        """
+        cache_key = ('json', event_type, limit)
+        cached = self._history_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        history = self.get_event_history(event_type, limit)
+        if orjson is not None:
+            encoded = orjson.dumps(history).decode()
+        else:
+            encoded = json.dumps(history)
+        self._history_cache[cache_key] = encoded
+        return encoded
+    
+    def _index_subscription(self, session_id: str, event_types: List[str]):
+        """Point each event type at this session id in the subscription index"""
+        self._drop_subscription(session_id)
+        for event_type in event_types:
+            self._subs.setdefault(event_type, set()).add(session_id)
+        self._sid_types[session_id] = list(event_types)
+
+    def _drop_subscription(self, session_id: str):
+        """Remove a session id from the subscription index"""
+        for event_type in self._sid_types.pop(session_id, []):
+            sids = self._subs.get(event_type)
+            if sids:
+                sids.discard(session_id)
+                if not sids:
+                    del self._subs[event_type]
+
+    def subscribe_to_events(self, user_id: str, event_types: List[str] = None, session_id: str = None):
         """Subscribe user to specific blockchain events"""
         if event_types is None:
             event_types = ['all']
-        
+
         self.subscribers[user_id] = event_types
-        logger.info(f"👤 User {user_id} subscribed to events: {event_types}")
-    
+
+        if session_id is None:
+            session_id = self.live_connections.get(user_id, {}).get('session_id')
+        if session_id:
+            self._index_subscription(session_id, event_types)
+        logger.info("👤 User %s subscribed to events: %s", user_id, event_types)
+
     def unsubscribe_from_events(self, user_id: str):
         """Unsubscribe user from blockchain events"""
         if user_id in self.subscribers:
             del self.subscribers[user_id]
-            logger.info(f"👤 User {user_id} unsubscribed from events")
-    
+            session_id = self.live_connections.get(user_id, {}).get('session_id')
+            if session_id:
+                self._drop_subscription(session_id)
+            logger.info("👤 User %s unsubscribed from events", user_id)
+
     def connect_user(self, user_id: str, session_id: str):
         """Connect user to real-time blockchain"""
         self.live_connections[user_id] = {
             'session_id': session_id,
-            'connected_at': datetime.now(timezone.utc).isoformat(),
-            'last_activity': datetime.now(timezone.utc).isoformat()
+            'connected_at': _utcnow_iso()
         }
-        logger.info(f"🔌 User {user_id} connected to real-time blockchain")
-    
+        self._last_activity[user_id] = time.time()
+        # Until the client narrows its subscription it receives everything
+        self._index_subscription(session_id, ['all'])
+        logger.info("🔌 User %s connected to real-time blockchain", user_id)
+
     def disconnect_user(self, user_id: str):
         """Disconnect user from real-time blockchain"""
         if user_id in self.live_connections:
+            self._drop_subscription(self.live_connections[user_id]['session_id'])
             del self.live_connections[user_id]
-            logger.info(f"🔌 User {user_id} disconnected from real-time blockchain")
+            self._last_activity.pop(user_id, None)
+            logger.info("🔌 User %s disconnected from real-time blockchain", user_id)
     
     def update_user_activity(self, user_id: str):
         """Update user's last activity timestamp"""
         if user_id in self.live_connections:
-            self.live_connections[user_id]['last_activity'] = datetime.now(timezone.utc).isoformat()
-    
+            self._last_activity[user_id] = time.time()
+
     def cleanup_inactive_connections(self, max_inactive_minutes: int = 30):
         """Clean up inactive connections"""
-        cutoff_time = datetime.now(timezone.utc).timestamp() - (max_inactive_minutes * 60)
-        
-        inactive_users = []
-        for user_id, connection in self.live_connections.items():
-            last_activity = datetime.fromisoformat(connection['last_activity']).timestamp()
-            if last_activity < cutoff_time:
-                inactive_users.append(user_id)
-        
+        cutoff_time = time.time() - (max_inactive_minutes * 60)
+
+        inactive_users = [user_id for user_id, last_activity in self._last_activity.items()
+                          if last_activity < cutoff_time]
+
         for user_id in inactive_users:
             self.disconnect_user(user_id)
         
         if inactive_users:
-            logger.info(f"🧹 Cleaned up {len(inactive_users)} inactive connections")
+            logger.info("🧹 Cleaned up %d inactive connections", len(inactive_users))
     
     def stop(self):
         """Stop the real-time blockchain system"""
         self.running = False
-        if self.event_thread.is_alive():
-            self.event_thread.join(timeout=5)
+        # Sentinel wakes the consumer out of its blocking get immediately;
+        # if the queue is saturated the consumer still exits via
+        # self.running within its get timeout
+        try:
+            self.event_queue.put_nowait(None)
+        except queue.Full:
+            pass
+        join = getattr(self.event_thread, 'join', None)
+        if join is not None:
+            try:
+                join(timeout=5)
+            except TypeError:
+                # Green-thread join variants take no timeout argument
+                join()
         logger.info("🛑 Real-time blockchain system stopped")
 
 
@@ -286,7 +547,7 @@ class BlockchainEventManager:
     def register_handler(self, event_type: str, handler: Callable):
         """Register custom event handler"""
         self.event_handlers[event_type] = handler
-        logger.info(f"📝 Registered handler for event type: {event_type}")
+        logger.info("📝 Registered handler for event type: %s", event_type)
     
     def handle_event(self, event: Dict):
         """Route event to appropriate handler"""
@@ -297,28 +558,30 @@ class BlockchainEventManager:
             try:
                 handler(event)
             except Exception as e:
-                logger.error(f"Error in event handler for {event_type}: {e}")
+                logger.error("Error in event handler for %s: %s", event_type, e)
         else:
-            logger.warning(f"No handler registered for event type: {event_type}")
+            # Debug level: event types without handlers (e.g. plain
+            # blockchain_update broadcasts) are routine, not a fault
+            logger.debug("No handler registered for event type: %s", event_type)
     
     def _handle_certificate_issued(self, event: Dict):
         """Handle certificate issued events"""
-        logger.info(f"🎫 Processing certificate issued: {event['data'].get('certificate_id')}")
+        logger.info("🎫 Processing certificate issued: %s", event['data'].get('certificate_id'))
         # Add custom logic here
     
     def _handle_certificate_verified(self, event: Dict):
         """Handle certificate verified events"""
-        logger.info(f"✅ Processing certificate verified: {event['data'].get('certificate_id')}")
+        logger.info("✅ Processing certificate verified: %s", event['data'].get('certificate_id'))
         # Add custom logic here
     
     def _handle_certificate_traded(self, event: Dict):
         """Handle certificate traded events"""
-        logger.info(f"💰 Processing certificate traded: {event['data'].get('certificate_id')}")
+        logger.info("💰 Processing certificate traded: %s", event['data'].get('certificate_id'))
         # Add custom logic here
     
     def _handle_certificate_retired(self, event: Dict):
         """Handle certificate retired events"""
-        logger.info(f"♻️ Processing certificate retired: {event['data'].get('certificate_id')}")
+        logger.info("♻️ Processing certificate retired: %s", event['data'].get('certificate_id'))
         # Add custom logic here
 
 
@@ -333,6 +596,8 @@ def init_realtime_blockchain(socketio: SocketIO, web3_provider: str = None):
     
     realtime_blockchain = RealTimeBlockchain(socketio, web3_provider)
     event_manager = BlockchainEventManager(realtime_blockchain)
+    # Broadcasts dispatch to the manager's handlers inline
+    realtime_blockchain.event_manager = event_manager
     
     logger.info("🌐 Real-time blockchain system initialized globally")
     return realtime_blockchain, event_manager
@@ -349,7 +614,8 @@ def get_event_manager() -> BlockchainEventManager:
 
 
 if __name__ == "__main__":
-    # Test the real-time blockchain system
+    # Test the real-time blockchain system (show the library's log output)
+    logging.basicConfig(level=logging.INFO)
     print("🧪 Testing Real-Time Blockchain System...")
     
     # Mock SocketIO for testing